@@ -1,18 +1,15 @@
+import time
 import streamlit as st
 import pandas as pd
 
-# ── M1 imports ─────────────────────────────────────────────────────────────────
-from src.preprocessing import preprocess_text, get_text_stats
-from src.document_loader import load_uploaded_files
-from src.feature_extraction import build_tfidf
-from src.topic_model import build_lda_model
-from src.evaluation import calculate_coherence
-from src.keyword_extractor import extract_keywords
-from src.summarizer import summarize_text
-from src.visualizations import generate_wordcloud, plot_top_keywords, plot_topic_distribution
+# M1 modules (spaCy, gensim, scikit-learn, matplotlib) are imported inside the
+# Milestone 1 branch so the Milestone 2 page never pays for loading them.
 
 # ── M2 imports ─────────────────────────────────────────────────────────────────
+from src.agent import config as agent_config
 from src.agent.graph import run_research_agent, stream_research_agent
+from src.agent.metrics import totals, trace_lines
+from src.agent.search import search_stats
 from src.agent.report_generator import format_report
 from src.pdf_export import generate_pdf_report
 
@@ -70,6 +67,17 @@ st.divider()
 # ══════════════════════════════════════════════════════════════════════════════
 if "Milestone 1" in mode:
 
+    # ── M1 imports ─────────────────────────────────────────────────────────────
+    from src.preprocessing import warmup, get_load_timings
+    from src.document_loader import load_uploaded_files
+    from src.pipeline import analysis_key, run_analysis_pipeline, resolve_coherence
+    from src.cache import TTLCache
+    from src.visualizations import render_wordcloud, render_top_keywords, render_topic_distribution
+
+    # Load spaCy/NLTK in the background while the user provides input
+    if agent_config.NLP_WARMUP:
+        warmup(background=True)
+
     # ── Sidebar ─────────────────────────────────────────────────────────────
     with st.sidebar:
         st.markdown("## 🔬 ResearchScope")
@@ -84,14 +92,54 @@ if "Milestone 1" in mode:
         st.divider()
 
         st.markdown("### ⚙️ Model Settings")
-        num_topics = st.slider("Number of LDA Topics", min_value=2, max_value=10, value=5)
+        auto_topics = st.checkbox(
+            "Auto-select topic count",
+            help="Train 2–10 topics in parallel and keep the count with the best coherence.",
+        )
+        num_topics = st.slider("Number of LDA Topics", min_value=2, max_value=10, value=5,
+                               disabled=auto_topics)
         num_keywords = st.slider("Top Keywords to Extract", min_value=5, max_value=30, value=15)
         num_summary_sentences = st.slider("Summary Sentences", min_value=2, max_value=10, value=5)
+        summary_label = st.selectbox(
+            "Summary Method",
+            ["TF-IDF score", "TextRank"],
+            help="TextRank ranks sentences by centrality in a similarity graph and is less biased toward long sentences.",
+        )
+        summary_method = "textrank" if summary_label == "TextRank" else "tfidf"
+        coherence_label = st.selectbox(
+            "Coherence Measure",
+            ["Cᵥ (thorough)", "UMass (fast)"],
+            help="Cᵥ re-scans the texts with a sliding window; UMass reuses the LDA bag-of-words corpus and is much faster.",
+        )
+        coherence_measure = "u_mass" if coherence_label.startswith("UMass") else "c_v"
+        corpus_label = st.radio(
+            "Corpus rows",
+            ["Combined", "Per document", "Chunks of N words"],
+            help="How uploaded text is split into documents for TF-IDF and LDA. "
+                 "One combined row makes IDF meaningless; per-document or chunked rows let LDA separate topics.",
+        )
+        corpus_mode = {"Combined": "combined", "Per document": "document",
+                       "Chunks of N words": "chunk"}[corpus_label]
+        chunk_words = 500
+        if corpus_mode == "chunk":
+            chunk_words = st.slider("Words per chunk", min_value=100, max_value=2000, value=500, step=100)
         st.divider()
 
         st.markdown("### ℹ️ About")
         st.info("Milestone 1 – Traditional NLP pipeline: TF-IDF + LDA + Extractive Summarization. No LLMs used.")
 
+        load_timings = get_load_timings()
+        if load_timings:
+            with st.expander("⏱️ Startup timings"):
+                labels = {
+                    "nltk_load_s": "NLTK data",
+                    "spacy_load_s": "spaCy model",
+                    "first_preprocess_s": "First preprocessing run",
+                }
+                for key, label in labels.items():
+                    if key in load_timings:
+                        st.caption(f"{label}: {load_timings[key]:.2f} s")
+
     # ── Header ──────────────────────────────────────────────────────────────
     st.markdown('<div class="main-title">🔬 ResearchScope</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-title">Intelligent Research Topic Analyzer — Milestone 1: Traditional NLP Pipeline</div>', unsafe_allow_html=True)
@@ -99,6 +147,7 @@ if "Milestone 1" in mode:
     # ── Input Section ────────────────────────────────────────────────────────
     raw_text = ""
     doc_names = []
+    docs = []
 
     if "Paste Text" in input_mode:
         raw_text = st.text_area(
@@ -108,16 +157,20 @@ if "Milestone 1" in mode:
         )
         if raw_text.strip():
             doc_names = ["Pasted Text"]
+            docs = [{"name": "Pasted Text", "text": raw_text}]
     else:
         uploaded_files = st.file_uploader(
             "📂 Upload research documents",
             type=["pdf", "txt"],
             accept_multiple_files=True,
-            help="Upload one or more PDF or TXT documents. They will be combined for analysis."
+            help="Upload one or more PDF or TXT documents. See \"Corpus rows\" in the sidebar for how they are combined."
         )
         if uploaded_files:
-            with st.spinner("Reading documents…"):
-                docs = load_uploaded_files(uploaded_files)
+            read_bar = st.progress(0.0, text="Reading documents…")
+            docs = load_uploaded_files(
+                uploaded_files, progress=lambda frac, msg: read_bar.progress(min(frac, 1.0), text=msg)
+            )
+            read_bar.empty()
             if docs:
                 raw_text = "\n\n".join(d["text"] for d in docs)
                 doc_names = [d["name"] for d in docs]
@@ -128,107 +181,179 @@ if "Milestone 1" in mode:
     # ── Analyse Button ───────────────────────────────────────────────────────
     run_analysis = st.button("🚀 Analyze", type="primary", use_container_width=True)
 
+    settings = dict(
+        num_topics=num_topics,  # with auto-select, the fallback if the sweep runs out of time
+        auto_topics=auto_topics,
+        num_keywords=num_keywords,
+        num_summary_sentences=num_summary_sentences,
+        corpus_mode=corpus_mode,
+        chunk_words=chunk_words,
+        summary_method=summary_method,
+        coherence_measure=coherence_measure,
+    )
+    current_key = analysis_key(docs, **settings) if raw_text.strip() else None
+
+    # Results live in one process-wide cache so reruns (tab switches, widget
+    # changes) re-render instantly; the LRU bound caps how many analyses the
+    # server holds across all sessions. Sessions only keep the key.
+    @st.cache_resource
+    def get_m1_cache(maxsize: int) -> TTLCache:
+        return TTLCache(maxsize=maxsize)
+
+    m1_cache = get_m1_cache(agent_config.M1_CACHE_ENTRIES)
+
     if run_analysis:
         if not raw_text.strip():
             st.warning("⚠️ Please provide some text or upload a document first.")
         else:
-            with st.spinner("Running NLP pipeline…"):
-                stats = get_text_stats(raw_text)
-                processed = preprocess_text(raw_text)
-                corpus = [processed]
-                tfidf_matrix, feature_names, _ = build_tfidf(corpus)
-                keywords = extract_keywords(tfidf_matrix, feature_names, top_n=num_keywords)
-                lda_model, topics, corpus_g, dictionary = build_lda_model(corpus, num_topics=num_topics)
-                try:
-                    coherence = calculate_coherence(lda_model, corpus, dictionary)
-                except Exception:
-                    coherence = None
-                summary, scored_sentences = summarize_text(raw_text, num_sentences=num_summary_sentences)
-
-            # ── Metrics Row ──────────────────────────────────────────────────
-            st.divider()
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("📄 Documents", len(doc_names))
-            col2.metric("🔤 Words", f"{stats['words']:,}")
-            col3.metric("📃 Sentences", stats["sentences"])
-            col4.metric("🔠 Unique Tokens", stats["unique_tokens"])
-            st.divider()
-
-            # ── Tabs ─────────────────────────────────────────────────────────
-            tab1, tab2, tab3, tab4 = st.tabs([
-                "📊 Keywords", "🧩 Topics", "📝 Summary", "📈 Visualizations"
-            ])
-
-            with tab1:
-                st.markdown("### 🔑 Top Keywords by TF-IDF Score")
-                st.caption("Words ranked by their term frequency–inverse document frequency weight.")
-                badge_html = "".join(
-                    f'<span class="keyword-badge">{w} <b>({s:.3f})</b></span>'
-                    for w, s in keywords
-                )
-                st.markdown(badge_html, unsafe_allow_html=True)
-                st.markdown("---")
-                df_kw = pd.DataFrame(keywords, columns=["Keyword", "TF-IDF Score"])
-                df_kw["TF-IDF Score"] = df_kw["TF-IDF Score"].round(4)
-                df_kw.index += 1
-                st.dataframe(df_kw, use_container_width=True)
-
-            with tab2:
-                st.markdown("### 🧩 LDA Topic Clusters")
-                if coherence is not None:
-                    coh_col1, coh_col2 = st.columns([1, 3])
-                    coh_col1.metric("Coherence Score (Cᵥ)", f"{coherence:.4f}",
-                                    help="Higher is better. Scores 0.4–0.7 indicate good topic separation.")
-                st.caption("Each topic is represented by its highest-probability words.")
-                st.markdown("---")
-                for topic_id, topic_str in topics:
-                    with st.expander(f"🔹 Topic {topic_id + 1}", expanded=(topic_id < 3)):
-                        pairs = []
-                        for part in topic_str.split(" + "):
-                            try:
-                                weight, word = part.split('*"')
-                                pairs.append((word.strip('"'), float(weight)))
-                            except ValueError:
-                                continue
-                        badges = "".join(
-                            f'<span class="keyword-badge">{w} ({wt:.3f})</span>'
-                            for w, wt in pairs
-                        )
-                        st.markdown(badges, unsafe_allow_html=True)
+            if current_key not in m1_cache:
+                with st.spinner("Running NLP pipeline…"):
+                    m1_cache.set(
+                        current_key,
+                        run_analysis_pipeline(
+                            docs, background_coherence=True, **settings
+                        ),
+                    )
+            st.session_state["m1_active_key"] = current_key
+
+    active_key = st.session_state.get("m1_active_key")
+    results = m1_cache.get(active_key) if active_key else None
+
+    if active_key and results is None:
+        st.info("ℹ️ The last analysis was evicted from the cache. Press Analyze to run it again.")
+    if results is not None:
+        if active_key != current_key:
+            st.info("ℹ️ Showing the last analysis. Press Analyze to apply changed input or settings.")
+        stats = results["stats"]
+        word_freqs = results["word_freqs"]
+        keywords = results["keywords"]
+        topics = results["topics"]
+        summary = results["summary"]
+        scored_sentences = results["scored_sentences"]
+        row_names = results["row_names"]
+        doc_topics = results["doc_topics"]
+        doc_keywords = results["doc_keywords"]
+        summary_label = "TextRank" if results["summary_method"] == "textrank" else "TF-IDF score"
+
+        # ── Metrics Row ──────────────────────────────────────────────────
+        st.divider()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("📄 Documents", results["doc_count"])
+        col2.metric("🔤 Words", f"{stats['words']:,}")
+        col3.metric("📃 Sentences", stats["sentences"])
+        col4.metric("🔠 Unique Tokens", stats["unique_tokens"])
+        st.divider()
 
-            with tab3:
-                st.markdown("### 📝 Extractive Summary")
-                st.caption("Sentences selected by TF-IDF score, in their original document order.")
-                st.markdown("---")
-                if summary:
-                    st.success(summary)
+        # ── Tabs ─────────────────────────────────────────────────────────
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            "📊 Keywords", "🧩 Topics", "📝 Summary", "📈 Visualizations", "📚 Documents"
+        ])
+
+        with tab1:
+            st.markdown("### 🔑 Top Keywords by TF-IDF Score")
+            st.caption("Words ranked by their term frequency–inverse document frequency weight.")
+            badge_html = "".join(
+                f'<span class="keyword-badge">{w} <b>({s:.3f})</b></span>'
+                for w, s in keywords
+            )
+            st.markdown(badge_html, unsafe_allow_html=True)
+            st.markdown("---")
+            df_kw = pd.DataFrame(keywords, columns=["Keyword", "TF-IDF Score"])
+            df_kw["TF-IDF Score"] = df_kw["TF-IDF Score"].round(4)
+            df_kw.index += 1
+            st.dataframe(df_kw, use_container_width=True)
+
+        with tab2:
+            st.markdown("### 🧩 LDA Topic Clusters")
+            coh_col1, coh_col2 = st.columns([1, 3])
+            coh_slot = coh_col1.empty()
+            coh_slot.caption("⏳ Scoring topic coherence…")
+            st.caption("Each topic is represented by its highest-probability words.")
+            if results.get("topic_warning"):
+                st.warning(f"⚠️ {results['topic_warning']}")
+            if results["topic_curve"]:
+                st.markdown(f"**Auto-selected {results['num_topics']} topics.** Coherence by topic count:")
+                df_curve = pd.DataFrame(results["topic_curve"], columns=["Topics", "Coherence"])
+                st.line_chart(df_curve.set_index("Topics"))
+            st.markdown("---")
+            for topic_id, topic_str in topics:
+                with st.expander(f"🔹 Topic {topic_id + 1}", expanded=(topic_id < 3)):
+                    pairs = []
+                    for part in topic_str.split(" + "):
+                        try:
+                            weight, word = part.split('*"')
+                            pairs.append((word.strip('"'), float(weight)))
+                        except ValueError:
+                            continue
+                    badges = "".join(
+                        f'<span class="keyword-badge">{w} ({wt:.3f})</span>'
+                        for w, wt in pairs
+                    )
+                    st.markdown(badges, unsafe_allow_html=True)
+
+        with tab3:
+            st.markdown("### 📝 Extractive Summary")
+            st.caption(f"Sentences selected by {summary_label}, in their original document order.")
+            st.markdown("---")
+            if summary:
+                st.success(summary)
+            else:
+                st.warning("Not enough text to generate a summary.")
+            if scored_sentences:
+                st.markdown("#### Sentence Scores")
+                df_sum = pd.DataFrame(scored_sentences, columns=["Sentence", "Score"])
+                df_sum["Score"] = df_sum["Score"].round(4)
+                df_sum.index += 1
+                st.dataframe(df_sum, use_container_width=True)
+
+        with tab4:
+            st.markdown("### 📈 Analytical Visualizations")
+            v1, v2 = st.columns(2)
+            with v1:
+                st.markdown("#### ☁️ Word Cloud")
+                if word_freqs:
+                    st.image(render_wordcloud(word_freqs), use_container_width=True)
                 else:
-                    st.warning("Not enough text to generate a summary.")
-                if scored_sentences:
-                    st.markdown("#### Sentence Scores")
-                    df_sum = pd.DataFrame(scored_sentences, columns=["Sentence", "Score"])
-                    df_sum["Score"] = df_sum["Score"].round(4)
-                    df_sum.index += 1
-                    st.dataframe(df_sum, use_container_width=True)
-
-            with tab4:
-                st.markdown("### 📈 Analytical Visualizations")
-                v1, v2 = st.columns(2)
-                with v1:
-                    st.markdown("#### ☁️ Word Cloud")
-                    if processed.strip():
-                        st.pyplot(generate_wordcloud(processed))
-                    else:
-                        st.info("Not enough text for a word cloud.")
-                with v2:
-                    st.markdown("#### 📊 Keyword Bar Chart")
-                    if keywords:
-                        st.pyplot(plot_top_keywords(keywords))
-                st.markdown("---")
-                st.markdown("#### 🧩 Topic Word Distribution")
-                topic_fig = plot_topic_distribution(topics)
-                if topic_fig:
-                    st.pyplot(topic_fig)
+                    st.info("Not enough text for a word cloud.")
+            with v2:
+                st.markdown("#### 📊 Keyword Bar Chart")
+                if keywords:
+                    st.image(render_top_keywords(keywords), use_container_width=True)
+            st.markdown("---")
+            st.markdown("#### 🧩 Topic Word Distribution")
+            topic_png = render_topic_distribution(topics)
+            if topic_png:
+                st.image(topic_png, use_container_width=True)
+
+        with tab5:
+            st.markdown("### 📚 Per-Document Topics & Keywords")
+            st.caption(f"{len(row_names)} corpus row(s). Topic mixture from LDA, keywords from each row's TF-IDF weights.")
+            st.markdown("---")
+            df_docs = pd.DataFrame({
+                "Document": row_names,
+                "Dominant Topic": [
+                    f"Topic {mix[0][0] + 1} ({mix[0][1]:.2f})" if mix else "—"
+                    for mix in doc_topics
+                ],
+                "Topic Mixture": [
+                    ", ".join(f"T{t + 1}: {p:.2f}" for t, p in mix if p >= 0.05)
+                    for mix in doc_topics
+                ],
+                "Top Keywords": [", ".join(w for w, _ in kws) for kws in doc_keywords],
+            })
+            df_docs.index += 1
+            st.dataframe(df_docs, use_container_width=True)
+
+        # ── Coherence (scored in the background, filled in last) ────────────
+        coherence = resolve_coherence(results)
+        if coherence is None:
+            coh_slot.empty()
+        elif results["coherence_measure"] == "u_mass":
+            coh_slot.metric("Coherence Score (UMass)", f"{coherence:.4f}",
+                            help="Closer to zero is better. UMass scores are negative.")
+        else:
+            coh_slot.metric("Coherence Score (Cᵥ)", f"{coherence:.4f}",
+                            help="Higher is better. Scores 0.4–0.7 indicate good topic separation.")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -254,6 +379,16 @@ elif "Milestone 2" in mode:
         st.markdown("**LLM:** Groq — `llama-3.3-70b-versatile`")
         st.markdown("**Search:** DuckDuckGo (no API key)")
         st.markdown("**Extension:** PDF Export")
+        with st.expander("📊 Search cache"):
+            s_stats = search_stats()
+            st.caption(
+                f"Hit rate: {s_stats['hit_rate']:.0%} · "
+                f"Requests: {s_stats['requests']} · "
+                f"Upstream calls: {s_stats['upstream_calls']} "
+                f"({s_stats['upstream_errors']} failed) · "
+                f"Coalesced: {s_stats['coalesced']} · "
+                f"Cached queries: {s_stats['cached_queries']}"
+            )
 
     # ── Header ──────────────────────────────────────────────────────────────
     st.markdown('<div class="m2-title">🤖 Agentic Research Assistant</div>', unsafe_allow_html=True)
@@ -265,6 +400,18 @@ elif "Milestone 2" in mode:
         placeholder="e.g. What are the latest advances in transformer-based NLP models?",
     )
 
+    use_llm_cache = st.checkbox(
+        "Reuse cached LLM responses",
+        value=True,
+        help="Serve identical summarize/report prompts from the response cache. Untick to force fresh LLM calls.",
+    )
+
+    single_call = st.checkbox(
+        "Fast mode: one LLM call",
+        value=agent_config.SINGLE_CALL_REPORT,
+        help="Write the summary and the structured report in a single JSON call. Falls back to the two-step flow if the reply is malformed.",
+    )
+
     run_agent = st.button("🚀 Research", type="primary", use_container_width=True)
 
     if run_agent:
@@ -278,6 +425,7 @@ elif "Milestone 2" in mode:
             steps_order = ["search", "retrieve", "validate", "summarize", "report"]
             step_status = {step: "pending" for step in steps_order}
             step_status["search"] = "active" # Initial active step
+            step_seconds = {}
             
             step_labels = {
                 "search": ("Searching the web...", "Search completed", "Pending"),
@@ -309,6 +457,8 @@ elif "Milestone 2" in mode:
                         icon = "✔"
                         color = "#22c55e" # Green
                         text = step_labels[step][1]
+                        if step in step_seconds:
+                            text += f" ({step_seconds[step]:.2f}s)"
                     elif status == "active":
                         icon = "⏳"
                         color = "#60a5fa" # Blue/Yellow spinner context
@@ -329,11 +479,44 @@ elif "Milestone 2" in mode:
             # Initial render
             render_progress()
 
+            # Live LLM output, filled in as tokens arrive while the LLM steps run.
+            # Re-rendering the whole text per token is quadratic, so redraws are
+            # throttled to one per LIVE_RENDER_INTERVAL seconds.
+            LIVE_RENDER_INTERVAL = 0.1
+            live_placeholder = st.empty()
+            live_titles = {"summarize": "🧠 Drafting summary…", "report": "📄 Drafting report…"}
+            live_text = {}
+            live_node, live_rendered_at, live_pending = None, 0.0, False
+
+            def render_live():
+                live_placeholder.markdown(f"**{live_titles.get(live_node, live_node)}**\n\n{live_text[live_node]}")
+
             # Execute graph and stream events
-            for event in stream_research_agent(query):
+            for kind, event in stream_research_agent(
+                query, use_cache=use_llm_cache, stream_tokens=True, single_call=single_call
+            ):
+                if kind == "token":
+                    live_node = event["node"]
+                    live_text[live_node] = live_text.get(live_node, "") + event["token"]
+                    now = time.monotonic()
+                    live_pending = now - live_rendered_at < LIVE_RENDER_INTERVAL
+                    if not live_pending:
+                        render_live()
+                        live_rendered_at = now
+                    continue
+                if live_pending:
+                    render_live()  # show the tail that arrived since the last redraw
+                    live_pending = False
                 for node_name, state in event.items():
                     final_state = state
-                    if node_name in step_status:
+                    for m in state.get("metrics") or []:
+                        step_seconds[m["node"]] = m["wall_s"]
+                    if node_name == "structured":
+                        # One call stands in for both LLM steps; on fallback they run as usual
+                        if state.get("report"):
+                            step_seconds["report"] = step_seconds["structured"]
+                            step_status["summarize"] = step_status["report"] = "completed"
+                    elif node_name in step_status:
                         step_status[node_name] = "completed"
                         curr_idx = steps_order.index(node_name)
                         if curr_idx + 1 < len(steps_order):
@@ -342,6 +525,7 @@ elif "Milestone 2" in mode:
                 
                 render_progress()
                 
+            live_placeholder.empty()
             has_error = bool(final_state and final_state.get("error"))
             render_progress(is_complete=True, has_error=has_error)
 
@@ -349,6 +533,34 @@ elif "Milestone 2" in mode:
             if has_error:
                 st.warning(f"⚠️ Note: {final_state['error']}")
 
+            llm_cached = final_state.get("llm_cached", {}) if final_state else {}
+            if llm_cached and all(llm_cached.values()):
+                st.caption("⚡ Report served from the LLM response cache.")
+            elif any(llm_cached.values()):
+                cached_steps = ", ".join(k for k, v in llm_cached.items() if v)
+                st.caption(f"⚡ Partially served from cache ({cached_steps}).")
+
+            run_metrics = final_state.get("metrics", []) if final_state else []
+            if run_metrics:
+                with st.expander("📊 Run metrics"):
+                    st.dataframe(
+                        pd.DataFrame(run_metrics).drop(columns=["started"]).set_index("node"),
+                        use_container_width=True,
+                    )
+                    t = totals(run_metrics)
+                    st.caption(
+                        f"Total {t['wall_s']:.2f}s · LLM {t['llm_s']:.2f}s "
+                        f"(first token after {t['ttft_s']:.2f}s) · {t['bytes_downloaded'] / 1024:.0f} KB downloaded · "
+                        f"{t['prompt_tokens']} prompt / {t['completion_tokens']} completion tokens · "
+                        f"{t['cache_hits']} cache hits"
+                    )
+                    st.download_button(
+                        label="Download trace (JSONL)",
+                        data=trace_lines(final_state),
+                        file_name=f"trace_{final_state.get('run_id', 'run')}.jsonl",
+                        mime="application/x-ndjson",
+                    )
+
             # ── Format Report ─────────────────────────────────────────────────
             report = format_report(final_state)
 
@@ -401,12 +613,23 @@ elif "Milestone 2" in mode:
                         url = source.get("url", "")
                         col_a, col_b = st.columns([3, 2])
                         col_a.markdown(f"**{i}. {title}**")
+                        if source.get("relevance") is not None:
+                            col_a.caption(f"Relevance to query: {source['relevance']:.2f}")
                         if url:
                             col_b.markdown(f"[Open link ↗]({url})")
                         st.divider()
                 else:
                     st.warning("No validated sources found.")
 
+                source_scores = final_state.get("source_scores", []) if final_state else []
+                if source_scores:
+                    with st.expander("📈 Relevance of all candidate sources"):
+                        st.dataframe(
+                            pd.DataFrame(source_scores)[["relevance", "selected", "title", "url"]],
+                            use_container_width=True,
+                            hide_index=True,
+                        )
+
             with r_tab3:
                 st.markdown("### 🧠 Raw LLM Summary")
                 st.caption("This is the intermediate summary generated by the LLM before structuring the report.")
@@ -0,0 +1,249 @@
+"""
+Offline benchmark for the Milestone 1 NLP pipeline.
+
+Generates deterministic synthetic corpora, times each pipeline stage
+separately, records its peak Python memory and writes the results as JSON.
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline                      # 1k–1M words
+    python -m benchmarks.bench_pipeline --sizes 1000 10000   # quick run
+    python -m benchmarks.bench_pipeline --update-baseline    # store a new baseline
+    python -m benchmarks.bench_pipeline --check              # fail on regressions
+
+Timings only compare on the same machine, so no baseline ships with the
+repository: the first --check run on a machine (or --update-baseline) records
+one at RS_BENCH_BASELINE (default: benchmarks/baseline.json).
+
+Needs the spaCy model and NLTK data from the README setup, but no network.
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.corpus import build_corpus
+from src.preprocessing import preprocess_text, preprocess_corpus, warmup
+from src.feature_extraction import build_tfidf
+from src.keyword_extractor import extract_keywords
+from src.topic_model import build_lda_model
+from src.evaluation import calculate_coherence
+from src.summarizer import summarize_text
+from src.pdf_export import generate_pdf_report
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+DEFAULT_BASELINE = os.getenv("RS_BENCH_BASELINE", os.path.join(HERE, "baseline.json"))
+# Run settings that must match the baseline's for timings to be comparable
+COMPARABLE_META = ("platform", "cpu_count", "seed", "topics", "passes", "chunk_words", "coherence")
+STAGES = [
+    "preprocess_text",
+    "build_tfidf",
+    "extract_keywords",
+    "build_lda_model",
+    "calculate_coherence",
+    "summarize_text",
+    "generate_pdf_report",
+]
+
+
+# ── Synthetic corpus ───────────────────────────────────────────────────────────
+def synthetic_text(n_words, seed=42, vocab_size=5000):
+    """
+    Deterministic pseudo-English text: a Zipf-distributed vocabulary of
+    made-up words plus common stopwords, in sentences of 8–25 words.
+    """
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "xe", "zu", "an", "er", "on"]
+    vocab = sorted({
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        for _ in range(vocab_size * 2)
+    })[:vocab_size]
+    rng.shuffle(vocab)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocab))))
+    stopwords = ["the", "of", "and", "to", "in", "is", "that", "for", "with", "as"]
+
+    sentences, produced = [], 0
+    while produced < n_words:
+        length = min(rng.randint(8, 25), n_words - produced)
+        words = rng.choices(vocab, cum_weights=cum_weights, k=length)
+        for i in range(length):
+            if rng.random() < 0.3:
+                words[i] = rng.choice(stopwords)
+        sentences.append(" ".join(words).capitalize() + ".")
+        produced += length
+    return " ".join(sentences)
+
+
+# ── Measurement ────────────────────────────────────────────────────────────────
+def measure(fn, repeat=1, memory=True):
+    """Best wall time over `repeat` runs, plus peak traced memory of one extra run."""
+    result, best = None, float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return result, best, peak_mb
+
+
+def bench_size(n_words, args):
+    """Run every stage on one corpus size; returns a list of result rows."""
+    text = synthetic_text(n_words, seed=args.seed)
+    _, row_texts = build_corpus([{"name": "bench", "text": text}], mode="chunk",
+                                chunk_words=args.chunk_words)
+    corpus = preprocess_corpus(row_texts)
+
+    state = {}
+    steps = {
+        "preprocess_text": lambda: preprocess_text(text),
+        "build_tfidf": lambda: build_tfidf(corpus),
+        "extract_keywords": lambda: extract_keywords(state["tfidf"][0], state["tfidf"][1], top_n=15),
+        "build_lda_model": lambda: build_lda_model(corpus, num_topics=args.topics, passes=args.passes),
+        "calculate_coherence": lambda: calculate_coherence(
+            state["lda"][0], corpus, state["lda"][3], measure=args.coherence, corpus=state["lda"][2]
+        ),
+        "summarize_text": lambda: summarize_text(text, num_sentences=5),
+        "generate_pdf_report": lambda: generate_pdf_report(state["report"]),
+    }
+
+    rows = []
+    for stage in STAGES:
+        if stage not in args.stages:
+            continue
+        if stage == "extract_keywords" and "tfidf" not in state:
+            state["tfidf"] = build_tfidf(corpus)
+        if stage == "calculate_coherence" and "lda" not in state:
+            state["lda"] = build_lda_model(corpus, num_topics=args.topics, passes=args.passes)
+        if stage == "generate_pdf_report":
+            summary, scored = summarize_text(text, num_sentences=5)
+            state["report"] = {
+                "title": f"Benchmark report ({n_words:,} words)",
+                "abstract": summary,
+                "key_findings": [s for s, _ in scored],
+                "conclusion": summary,
+                "sources": [{"title": f"Source {i}", "url": f"https://example.org/{i}"} for i in range(5)],
+            }
+
+        result, seconds, peak_mb = measure(steps[stage], repeat=args.repeat, memory=not args.no_memory)
+        if stage == "build_tfidf":
+            state["tfidf"] = result
+        elif stage == "build_lda_model":
+            state["lda"] = result
+        rows.append({"stage": stage, "words": n_words, "seconds": round(seconds, 4),
+                     "peak_mb": None if peak_mb is None else round(peak_mb, 2)})
+        mem = "" if peak_mb is None else f"  {peak_mb:9.1f} MB"
+        print(f"{stage:<22}{n_words:>10,} words  {seconds:9.3f} s{mem}", flush=True)
+    return rows
+
+
+# ── Baseline comparison ────────────────────────────────────────────────────────
+def compare(results, baseline, tolerance, min_delta):
+    """Rows slower than baseline by more than `tolerance` (fraction) and `min_delta` seconds."""
+    base = {(r["stage"], r["words"]): r for r in baseline["results"]}
+    regressions = []
+    for row in results["results"]:
+        ref = base.get((row["stage"], row["words"]))
+        if ref is None:
+            continue
+        limit = max(ref["seconds"] * (1 + tolerance), ref["seconds"] + min_delta)
+        if row["seconds"] > limit:
+            regressions.append({**row, "baseline_seconds": ref["seconds"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Milestone 1 NLP pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="corpus sizes in words (default: 1k 10k 100k 1M)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage; the best is kept")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--passes", type=int, default=10)
+    parser.add_argument("--chunk-words", type=int, default=500,
+                        help="words per corpus row for TF-IDF / LDA")
+    parser.add_argument("--coherence", choices=["c_v", "u_mass"], default="c_v")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak-memory run")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline file (default: $RS_BENCH_BASELINE or benchmarks/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="also write the results to the baseline file")
+    parser.add_argument("--check", action="store_true",
+                        help="exit non-zero if any stage regressed against the baseline; "
+                             "records the baseline if there is none yet")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline time")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    warmup(background=False)  # keep model loading out of the first stage's timing
+    rows = []
+    for n_words in args.sizes:
+        rows.extend(bench_size(n_words, args))
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "topics": args.topics,
+            "passes": args.passes,
+            "chunk_words": args.chunk_words,
+            "coherence": args.coherence,
+        },
+        "results": rows,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.check and not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}: recording this run as the baseline. "
+              f"Later --check runs on this machine compare against it.")
+        args.update_baseline, args.check = True, False
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatched = [k for k in COMPARABLE_META
+                      if baseline.get("meta", {}).get(k) != results["meta"][k]]
+        if mismatched:
+            print(f"Warning: baseline was recorded with different {', '.join(mismatched)}; "
+                  f"timings may not be comparable.")
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} @ {r['words']:,} words: "
+                  f"{r['seconds']:.3f} s vs baseline {r['baseline_seconds']:.3f} s")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
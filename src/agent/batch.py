@@ -0,0 +1,119 @@
+"""
+Batch research: run many queries concurrently through the research graph.
+
+    python -m src.agent.batch queries.txt -o reports.jsonl --concurrency 4
+
+The query file holds one query per line; blank lines and lines starting
+with "#" are skipped. Runs share the process-wide fetch engine, LLM client,
+caches and rate limiters, and each report is appended to the output file
+as soon as its run finishes.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.agent import config
+from src.agent.graph import run_research_agent
+from src.agent.metrics import totals
+
+
+def read_queries(path: str) -> list:
+    """Non-empty, non-comment lines of a query file."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _run_one(query: str, use_cache: bool, single_call) -> dict:
+    start = time.perf_counter()
+    try:
+        state = run_research_agent(query, use_cache=use_cache, single_call=single_call)
+    except Exception as e:
+        return {"query": query, "ok": False, "error": str(e),
+                "seconds": round(time.perf_counter() - start, 3)}
+    return {
+        "query": query,
+        "ok": True,
+        "error": state.get("error"),
+        "seconds": round(time.perf_counter() - start, 3),
+        "report": state.get("report", {}),
+        "llm_summary": state.get("llm_summary", ""),
+        "metrics": totals(state.get("metrics") or []),
+    }
+
+
+def run_batch(queries, output_path: str, concurrency: int = None, use_cache: bool = True,
+              single_call: bool = None, on_result=None) -> dict:
+    """
+    Research every query with `concurrency` runs in flight (default:
+    RS_BATCH_CONCURRENCY) and append one JSON line per finished run to
+    `output_path`. `on_result(record)` is called after each line is written.
+
+    A run that raises is recorded with ok=False; a run that completed with a
+    warning (e.g. the LLM step failed) is recorded with ok=True and its error.
+    Returns counts, elapsed time and throughput.
+    """
+    queries = list(queries)
+    concurrency = max(1, concurrency or config.BATCH_CONCURRENCY)
+    write_lock = threading.Lock()
+    stats = {"queries": len(queries), "succeeded": 0, "warnings": 0, "failed": 0}
+
+    start = time.perf_counter()
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as pool:
+        futures = [pool.submit(_run_one, q, use_cache, single_call) for q in queries]
+        for future in as_completed(futures):
+            record = future.result()
+            with write_lock:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+            if not record["ok"]:
+                stats["failed"] += 1
+            elif record["error"]:
+                stats["warnings"] += 1
+            else:
+                stats["succeeded"] += 1
+            if on_result is not None:
+                on_result(record)
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_s"] = round(elapsed, 2)
+    stats["queries_per_min"] = round(len(queries) / elapsed * 60, 2) if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the research agent over a file of queries.")
+    parser.add_argument("queries", help="text file with one query per line")
+    parser.add_argument("-o", "--output", default="reports.jsonl", help="JSONL file reports are appended to")
+    parser.add_argument("-c", "--concurrency", type=int, default=config.BATCH_CONCURRENCY)
+    parser.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache")
+    parser.add_argument("--single-call", action="store_true",
+                        help="write summary and report in one structured LLM call")
+    args = parser.parse_args(argv)
+
+    queries = read_queries(args.queries)
+    done = [0]
+
+    def progress(record):
+        done[0] += 1
+        status = "ok" if record["ok"] and not record["error"] else ("warning" if record["ok"] else "FAILED")
+        print(f"[{done[0]}/{len(queries)}] {status:<7} {record['seconds']:6.1f}s  {record['query']}",
+              flush=True)
+
+    stats = run_batch(
+        queries, args.output, concurrency=args.concurrency, use_cache=not args.no_cache,
+        single_call=True if args.single_call else None, on_result=progress,
+    )
+    print(
+        f"{stats['queries']} queries in {stats['elapsed_s']}s "
+        f"({stats['queries_per_min']} / min): {stats['succeeded']} ok, "
+        f"{stats['warnings']} with warnings, {stats['failed']} failed. Reports: {args.output}"
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
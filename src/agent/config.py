@@ -0,0 +1,71 @@
+import os
+
+# Tunables for the Milestone 2 research agent, plus the Milestone 1 settings
+# at the end. Each value can be overridden through an environment variable so
+# deployments can size them without edits.
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# ── Retrieval ──────────────────────────────────────────────────────────────────
+FETCH_CONCURRENCY = _env_int("RS_FETCH_CONCURRENCY", 8)     # pages in flight overall
+FETCH_PER_HOST = _env_int("RS_FETCH_PER_HOST", 2)           # pages in flight per host
+FETCH_TIMEOUT = _env_float("RS_FETCH_TIMEOUT", 8.0)         # seconds per request
+FETCH_MAX_BYTES = _env_int("RS_FETCH_MAX_BYTES", 512 * 1024)  # body bytes read per page
+PAGE_TEXT_CHARS = _env_int("RS_PAGE_TEXT_CHARS", 3000)      # paragraph text kept per page
+RETRIEVE_DEADLINE = _env_float("RS_RETRIEVE_DEADLINE", 10.0)  # seconds for the whole step
+SEARCH_RATE_PER_MIN = _env_float("RS_SEARCH_RATE_PER_MIN", 30)  # upstream searches per minute (0 = unlimited)
+SEARCH_RATE_BURST = _env_int("RS_SEARCH_RATE_BURST", 4)         # searches allowed back to back
+SEARCH_RESULTS = _env_int("RS_SEARCH_RESULTS", 10)          # search hits considered per query
+CANDIDATE_SOURCES = _env_int("RS_CANDIDATE_SOURCES", 8)     # stop fetching once this many sources are valid
+TARGET_SOURCES = _env_int("RS_TARGET_SOURCES", 5)           # most relevant candidates passed to the LLM
+MIN_RELEVANCE = _env_float("RS_MIN_RELEVANCE", 0.02)        # query similarity below which a source is dropped
+MIN_SOURCE_CHARS = _env_int("RS_MIN_SOURCE_CHARS", 100)     # shorter source text is rejected as trivial
+DEDUP_THRESHOLD = _env_float("RS_DEDUP_THRESHOLD", 0.8)     # shingle Jaccard at which sources are near-duplicates (1 = off)
+
+# ── LLM ────────────────────────────────────────────────────────────────────────
+LLM_RATE_PER_MIN = _env_float("RS_LLM_RATE_PER_MIN", 30)   # sustained LLM calls per minute (0 = unlimited)
+LLM_RATE_BURST = _env_int("RS_LLM_RATE_BURST", 4)          # calls allowed back to back
+# Ask for summary and report in one JSON call, falling back to two calls if invalid
+SINGLE_CALL_REPORT = os.getenv("RS_SINGLE_CALL_REPORT", "0").lower() in ("1", "true", "yes")
+
+# ── Caching ────────────────────────────────────────────────────────────────────
+CACHE_DIR = os.getenv(
+    "RS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "researchscope")
+)
+PAGE_CACHE_TTL = _env_float("RS_PAGE_CACHE_TTL", 6 * 3600)  # seconds before revalidation
+PAGE_CACHE_MAX_MB = _env_int("RS_PAGE_CACHE_MAX_MB", 64)    # extracted text kept on disk
+PDF_TEXT_CACHE_MAX_MB = _env_int("RS_PDF_TEXT_CACHE_MAX_MB", 256)  # extracted PDF text kept on disk
+SEARCH_CACHE_TTL = _env_float("RS_SEARCH_CACHE_TTL", 15 * 60)  # seconds a query's hits are reused
+SEARCH_CACHE_SIZE = _env_int("RS_SEARCH_CACHE_SIZE", 512)      # distinct queries kept in memory
+LLM_CACHE_MEMORY_SIZE = _env_int("RS_LLM_CACHE_MEMORY_SIZE", 256)   # responses kept in RAM
+LLM_CACHE_MAX_ENTRIES = _env_int("RS_LLM_CACHE_MAX_ENTRIES", 5000)  # responses kept on disk
+LLM_CACHE_TTL = _env_float("RS_LLM_CACHE_TTL", 7 * 24 * 3600)       # seconds a response is reused
+
+# ── Batch runs ─────────────────────────────────────────────────────────────────
+BATCH_CONCURRENCY = _env_int("RS_BATCH_CONCURRENCY", 4)     # queries researched at once
+
+# ── Service ────────────────────────────────────────────────────────────────────
+SERVICE_WORKERS = _env_int("RS_SERVICE_WORKERS", 2)         # research runs executed at once
+SERVICE_QUEUE_SIZE = _env_int("RS_SERVICE_QUEUE_SIZE", 32)  # jobs waiting before submissions are refused
+SERVICE_JOB_TTL = _env_float("RS_SERVICE_JOB_TTL", 3600)    # seconds a finished job stays pollable
+
+# ── Metrics ────────────────────────────────────────────────────────────────────
+TRACE_FILE = os.getenv("RS_TRACE_FILE", "")  # JSON-lines file each run's trace is appended to
+
+# ── Milestone 1 ────────────────────────────────────────────────────────────────
+M1_CACHE_ENTRIES = _env_int("RS_M1_CACHE_ENTRIES", 8)              # analyses kept across all sessions
+TOPIC_SWEEP_BUDGET = _env_float("RS_TOPIC_SWEEP_BUDGET", 120.0)    # seconds for the topic-count sweep
+NLP_WARMUP = os.getenv("RS_NLP_WARMUP", "1").lower() in ("1", "true", "yes")  # load spaCy/NLTK early
@@ -0,0 +1,104 @@
+import re
+import zlib
+
+import numpy as np
+
+from src.agent import config
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32: a*x + b stays below 2**64
+_WORD_RE = re.compile(r"\w+")
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles. The Jaccard similarity of two
+    texts' shingle sets is estimated by the fraction of equal signature slots.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=(num_perm, 1), dtype=np.uint64)
+
+    def shingles(self, text: str) -> set:
+        words = _WORD_RE.findall(text.lower())
+        k = self.shingle_size
+        if len(words) <= k:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)), dtype=np.uint64
+        )
+        # All permutations at once: (num_perm, 1) against (n_shingles,)
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        return float(np.mean(sig_a == sig_b))
+
+
+def _lsh_bands(threshold: float, num_perm: int):
+    """
+    (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1/bands) ** (1/rows) is the highest one not above `threshold`, so
+    pairs at the threshold are very likely to share a bucket.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    Keeps texts that are not near-duplicates of a text already kept.
+    Candidates are found with LSH banding over MinHash signatures, so each
+    add() costs the same no matter how many texts were kept before; only
+    candidates whose estimated Jaccard similarity reaches `threshold` count
+    as duplicates.
+    """
+
+    def __init__(self, threshold: float = None, num_perm: int = 64, shingle_size: int = 3):
+        self.threshold = config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = _lsh_bands(self.threshold, num_perm)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = []
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def find(self, text: str):
+        """(index of the kept text it duplicates or None, signature)."""
+        sig = self.hasher.signature(text)
+        checked = set()
+        for band, key in self._band_keys(sig):
+            for idx in self._buckets[band].get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if MinHasher.similarity(sig, self._signatures[idx]) >= self.threshold:
+                    return idx, sig
+        return None, sig
+
+    def add(self, text: str) -> bool:
+        """Keep `text` unless it near-duplicates a kept one. Returns True if kept."""
+        if self.threshold >= 1:
+            return True  # disabled
+        duplicate_of, sig = self.find(text)
+        if duplicate_of is not None:
+            return False
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        for band, key in self._band_keys(sig):
+            self._buckets[band].setdefault(key, []).append(idx)
+        return True
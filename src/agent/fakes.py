@@ -0,0 +1,117 @@
+"""
+Stand-in search, HTTP and LLM backends for running the research agent
+locally without network access or an API key:
+
+    from src.agent.fakes import install_fake_backends
+    install_fake_backends(latency=0.2)
+
+Every query gets the same handful of synthetic sources; pages are served by
+an in-process httpx transport and the LLM replies with a canned report in
+whichever format the prompt asks for.
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import httpx
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.agent.fetcher import FetchEngine, set_engine
+from src.agent.llm_cache import MemoryResponseCache, set_response_cache
+from src.agent.nodes import set_llm
+from src.agent.page_cache import PageCache, set_page_cache
+from src.agent.search import set_search_backend
+
+FAKE_HOST = "fake-source.invalid"
+_WORDS = ("model", "data", "study", "results", "method", "analysis", "training", "network",
+          "accuracy", "benchmark", "evaluation", "dataset", "approach", "performance",
+          "language", "research", "system", "learning", "baseline", "experiment")
+
+
+def fake_search(query: str, max_results: int = 6) -> list:
+    return [
+        {
+            "title": f"Source {i} on {query}",
+            "href": f"https://{FAKE_HOST}/{i}?q={query.replace(' ', '+')}",
+            "body": f"Snippet {i} about {query}.",
+        }
+        for i in range(max_results)
+    ]
+
+
+def fake_transport(latency: float = 0.0) -> httpx.MockTransport:
+    """Serves a paragraph-rich HTML page for every URL after `latency` seconds."""
+    async def handler(request):
+        if latency:
+            await asyncio.sleep(latency)
+        topic = request.url.params.get("q", "the topic").replace("+", " ")
+        rng = random.Random(request.url.path)  # distinct, stable text per source
+        paragraphs = "".join(
+            f"<p>Findings on {topic}: {' '.join(rng.choices(_WORDS, k=40))}.</p>"
+            for _ in range(12)
+        )
+        return httpx.Response(200, html=f"<html><body>{paragraphs}</body></html>")
+    return httpx.MockTransport(handler)
+
+
+class FakeLLM:
+    """Chat-model stand-in with invoke() and stream() and a fixed per-call latency."""
+
+    model_name = "fake-llm"
+    temperature = 0.0
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _reply(self, prompt: str) -> str:
+        if "single JSON object" in prompt:
+            return json.dumps({
+                "summary": "A stand-in summary of the sources.",
+                "title": "Stand-in Research Report",
+                "abstract": "An abstract produced by the fake LLM.",
+                "key_findings": [f"Finding {i}" for i in range(1, 6)],
+                "conclusion": "A conclusion produced by the fake LLM.",
+            })
+        if "KEY FINDINGS" in prompt:
+            findings = "\n".join(f"- Finding {i}" for i in range(1, 6))
+            return (
+                "TITLE: Stand-in Research Report\n"
+                "ABSTRACT: An abstract produced by the fake LLM.\n"
+                f"KEY FINDINGS:\n{findings}\n"
+                "CONCLUSION: A conclusion produced by the fake LLM."
+            )
+        return "A stand-in summary of the sources.\n\nA second paragraph."
+
+    def _usage(self, prompt: str, text: str) -> dict:
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(text) // 4
+        return {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def invoke(self, prompt: str):
+        time.sleep(self.latency)
+        text = self._reply(prompt)
+        return AIMessage(content=text, usage_metadata=self._usage(prompt, text))
+
+    def stream(self, prompt: str):
+        text = self._reply(prompt)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.latency / len(words))
+            yield AIMessageChunk(content=word if i == 0 else " " + word)
+        yield AIMessageChunk(content="", usage_metadata=self._usage(prompt, text))
+
+
+def install_fake_backends(latency: float = 0.0):
+    """
+    Route search, page fetching and the LLM to the stand-ins above, with
+    throwaway caches so nothing reaches the real on-disk caches.
+    """
+    set_search_backend(fake_search)
+    set_engine(FetchEngine(transport=fake_transport(latency)))
+    set_llm(FakeLLM(latency))
+    set_response_cache(MemoryResponseCache(256))
+    cache_dir = tempfile.mkdtemp(prefix="researchscope-fake-")
+    set_page_cache(PageCache(os.path.join(cache_dir, "pages.sqlite3"), ttl=3600, max_bytes=8 * 2 ** 20))
@@ -0,0 +1,208 @@
+import asyncio
+import codecs
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.agent import config
+from src.agent.html_text import ParagraphText
+
+USER_AGENT = "Mozilla/5.0"
+# Bodies of other types (PDFs, images, archives...) are never downloaded
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_DONE = object()
+
+
+class FetchEngine:
+    """
+    Async page fetcher with a shared connection pool, a global concurrency
+    limit and a per-host limit. It owns an event loop on a daemon thread so
+    the pooled AsyncClient survives across graph runs and Streamlit reruns,
+    while callers stay plain synchronous code.
+    """
+
+    def __init__(self, max_concurrency=None, per_host=None, timeout=None, transport=None,
+                 max_bytes=None, text_chars=None):
+        self.max_concurrency = max_concurrency or config.FETCH_CONCURRENCY
+        self.per_host = per_host or config.FETCH_PER_HOST
+        self.timeout = timeout or config.FETCH_TIMEOUT
+        self.max_bytes = max_bytes or config.FETCH_MAX_BYTES
+        self.text_chars = text_chars or config.PAGE_TEXT_CHARS
+        self._transport = transport
+        self._client = None
+        self._global_slots = None
+        self._host_slots = {}  # host -> [semaphore, requests using it]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fetch-engine", daemon=True
+        )
+        self._thread.start()
+
+    # ── Event-loop side ────────────────────────────────────────────────────────
+    def _ensure_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                transport=self._transport,
+            )
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def _fetch_one(self, url: str, headers: dict) -> dict:
+        # Per-host slot first: requests queued behind a busy host must not sit
+        # on global slots that other hosts could use. Host entries live only
+        # while requests for that host exist, so the table stays small.
+        try:
+            host = urlsplit(url).hostname or ""
+        except ValueError:
+            host = ""  # malformed URL: the request itself reports the error
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = [asyncio.Semaphore(self.per_host), 0]
+        slot[1] += 1
+        try:
+            async with slot[0], self._global_slots:
+                return await self._get(url, headers)
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0 and self._host_slots.get(host) is slot:
+                del self._host_slots[host]
+
+    async def _get(self, url: str, headers: dict) -> dict:
+        try:
+            async with self._client.stream("GET", url, headers=headers) as resp:
+                content_type = resp.headers.get("content-type", "").split(";")[0].strip().lower()
+                encoding = _encoding(resp)
+                body, truncated, extractor = b"", False, None
+                if not content_type or content_type in TEXT_CONTENT_TYPES:
+                    if content_type != "text/plain":
+                        extractor = ParagraphText(self.text_chars)
+                    body, truncated = await self._read_capped(resp, encoding, extractor)
+                page = {
+                    "url": url,
+                    "ok": True,
+                    "status": resp.status_code,
+                    "content_type": content_type,
+                    "text": body.decode(encoding, errors="replace"),
+                    "bytes": len(body),
+                    "truncated": truncated,
+                    "etag": resp.headers.get("etag"),
+                    "last_modified": resp.headers.get("last-modified"),
+                }
+                if extractor is not None:
+                    page["paragraphs"] = extractor.close()
+                return page
+        except Exception as e:
+            return {"url": url, "ok": False, "error": str(e)}
+
+    async def _read_capped(self, resp, encoding: str, extractor=None):
+        """
+        Read at most max_bytes of the body; leaving the stream early drops the
+        rest. With an extractor, each chunk is parsed as it arrives and reading
+        stops as soon as it has enough paragraph text.
+        """
+        chunks, size = [], 0
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        async for chunk in resp.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                body = b"".join(chunks)[:self.max_bytes]
+                if extractor is not None:
+                    extractor.feed(decoder.decode(chunk[:len(chunk) - (size - self.max_bytes)], final=True))
+                return body, True
+            if extractor is not None and extractor.feed(decoder.decode(chunk)):
+                return b"".join(chunks), True
+        if extractor is not None:
+            extractor.feed(decoder.decode(b"", final=True))
+        return b"".join(chunks), False
+
+    async def _run(self, urls: list, headers: dict, out: queue.Queue):
+        self._ensure_client()
+        tasks = [
+            asyncio.create_task(self._fetch_one(u, headers.get(u, {}))) for u in urls
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                out.put(await next_done)
+        finally:
+            for task in tasks:
+                task.cancel()
+            out.put(_DONE)
+
+    # ── Caller side ────────────────────────────────────────────────────────────
+    def iter_fetch(self, urls, deadline=None, headers=None):
+        """
+        Yield one result dict per URL in completion order, until every URL has
+        finished or `deadline` seconds have passed. Closing the generator early
+        cancels whatever is still in flight. `headers` optionally maps a URL to
+        extra request headers (e.g. conditional revalidation headers).
+        Result dicts: {"url", "ok", "status", "content_type", "text", "bytes",
+        "truncated", "etag", "last_modified"} or {"url", "ok", "error"}.
+        Bodies are capped at max_bytes, and only read at all for
+        TEXT_CONTENT_TYPES (other types come back with empty text). HTML
+        results also carry "paragraphs": up to text_chars of <p> text,
+        extracted while downloading; the download stops once it is complete.
+        """
+        deadline = config.RETRIEVE_DEADLINE if deadline is None else deadline
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return
+        out = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._run(urls, headers or {}, out), self._loop)
+        stop_at = time.monotonic() + deadline
+        try:
+            while True:
+                remaining = stop_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = out.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            future.cancel()
+
+    def fetch_all(self, urls, deadline=None, headers=None) -> dict:
+        """Fetch all URLs concurrently; returns {url: result} for pages done by the deadline."""
+        return {r["url"]: r for r in self.iter_fetch(urls, deadline, headers)}
+
+
+def _encoding(resp) -> str:
+    """The response's declared charset if Python knows it, else UTF-8."""
+    try:
+        return codecs.lookup(resp.charset_encoding or "utf-8").name
+    except LookupError:
+        return "utf-8"
+
+
+# ── Shared engine ──────────────────────────────────────────────────────────────
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> FetchEngine:
+    """Return the process-wide fetch engine, creating it on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine()
+        return _engine
+
+
+def set_engine(engine: FetchEngine):
+    """Swap in a different engine (e.g. one built on a stand-in transport)."""
+    global _engine
+    with _engine_lock:
+        _engine = engine
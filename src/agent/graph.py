@@ -1,4 +1,6 @@
 from langgraph.graph import StateGraph, END
+from src.agent import config
+from src.agent.metrics import export_trace, instrument, new_run_id
 from src.agent.state import ResearchState
 from src.agent.nodes import (
     search_node,
@@ -6,24 +8,37 @@ from src.agent.nodes import (
     validate_node,
     summarize_node,
     report_node,
+    structured_node,
 )
 
+
+def _route_after_validate(state: dict) -> str:
+    return "structured" if state.get("single_call") else "summarize"
+
+
+def _route_after_structured(state: dict) -> str:
+    # An empty report means the JSON reply failed validation: use the two-call flow
+    return END if state.get("report") else "summarize"
+
+
 def build_research_graph():
     """Build and compile the LangGraph research agent workflow."""
     graph = StateGraph(ResearchState)
 
-    # Add all 5 nodes
-    graph.add_node("search", search_node)
-    graph.add_node("retrieve", retrieve_node)
-    graph.add_node("validate", validate_node)
-    graph.add_node("summarize", summarize_node)
-    graph.add_node("report", report_node)
+    # Add the nodes, each timed and counted into state["metrics"]
+    graph.add_node("search", instrument("search", search_node))
+    graph.add_node("retrieve", instrument("retrieve", retrieve_node))
+    graph.add_node("validate", instrument("validate", validate_node))
+    graph.add_node("summarize", instrument("summarize", summarize_node))
+    graph.add_node("report", instrument("report", report_node))
+    graph.add_node("structured", instrument("structured", structured_node))
 
-    # Define the linear edge flow
+    # Define the edge flow; single-call runs try "structured" before summarize → report
     graph.set_entry_point("search")
     graph.add_edge("search", "retrieve")
     graph.add_edge("retrieve", "validate")
-    graph.add_edge("validate", "summarize")
+    graph.add_conditional_edges("validate", _route_after_validate, ["structured", "summarize"])
+    graph.add_conditional_edges("structured", _route_after_structured, ["summarize", END])
     graph.add_edge("summarize", "report")
     graph.add_edge("report", END)
 
@@ -34,38 +49,68 @@ def build_research_graph():
 research_graph = build_research_graph()
 
 
-def run_research_agent(query: str) -> dict:
-    """
-    Entry point: run the full research pipeline for a given query.
-    Returns the final ResearchState dict.
-    """
-    initial_state = ResearchState(
+def _initial_state(query: str, use_cache: bool = True, stream_tokens: bool = False,
+                   single_call: bool = None) -> ResearchState:
+    if single_call is None:
+        single_call = config.SINGLE_CALL_REPORT
+    return ResearchState(
         query=query,
         search_results=[],
         retrieved_texts=[],
         validated_sources=[],
+        source_scores=[],
         llm_summary="",
         report={},
         status="Starting...",
         error=None,
+        use_cache=use_cache,
+        stream_tokens=stream_tokens,
+        single_call=single_call,
+        llm_cached={},
+        run_id=new_run_id(),
+        metrics=[],
     )
-    result = research_graph.invoke(initial_state)
+
+
+def run_research_agent(query: str, use_cache: bool = True, single_call: bool = None) -> dict:
+    """
+    Entry point: run the full research pipeline for a given query.
+    Set use_cache=False to bypass the LLM response cache for this run.
+    single_call=True writes summary and report in one structured LLM call
+    (default: RS_SINGLE_CALL_REPORT), falling back to two calls if invalid.
+    Returns the final ResearchState dict; per-node timings and counters are
+    in result["metrics"] and are appended to RS_TRACE_FILE when it is set.
+    """
+    result = research_graph.invoke(_initial_state(query, use_cache, single_call=single_call))
+    export_trace(result)
     return result
 
-def stream_research_agent(query: str):
+def stream_research_agent(query: str, use_cache: bool = True, stream_tokens: bool = False,
+                          single_call: bool = None):
     """
     Entry point for streaming the pipeline.
-    Yields each state update to track progress.
+    Yields each state update to track progress; each update carries the
+    metrics of the nodes run so far. The trace is exported once the run ends.
+
+    With stream_tokens=True, LLM output is streamed as well and every item
+    is a (kind, payload) tuple: ("update", {node: state}) after each node,
+    or ("token", {"node": node, "token": text}) for each chunk of LLM text.
+    The single-call JSON reply is not streamed as tokens.
     """
-    initial_state = ResearchState(
-        query=query,
-        search_results=[],
-        retrieved_texts=[],
-        validated_sources=[],
-        llm_summary="",
-        report={},
-        status="Starting...",
-        error=None,
-    )
-    for event in research_graph.stream(initial_state):
-        yield event
+    final_state = None
+    if not stream_tokens:
+        for event in research_graph.stream(_initial_state(query, use_cache, single_call=single_call)):
+            for state in event.values():
+                final_state = state
+            yield event
+    else:
+        initial = _initial_state(query, use_cache, stream_tokens=True, single_call=single_call)
+        for mode, chunk in research_graph.stream(initial, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield "token", chunk
+                continue
+            for state in chunk.values():
+                final_state = state
+            yield "update", chunk
+    if final_state is not None:
+        export_trace(final_state)
@@ -0,0 +1,95 @@
+from html.parser import HTMLParser
+
+
+class _EnoughText(Exception):
+    pass
+
+
+class _ParagraphParser(HTMLParser):
+    """
+    Collects the text of <p> elements (skipping <script>/<style> inside them)
+    and aborts the parse by raising _EnoughText once `limit` chars are in.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.paragraphs = []
+        self._current = None
+        self._skip_depth = 0
+        self._size = 0
+
+    def _close_paragraph(self):
+        if self._current is not None:
+            text = "".join(self._current)
+            self.paragraphs.append(text)
+            self._size += len(text) + 1
+            self._current = None
+            if self._size > self.limit:
+                raise _EnoughText
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "p":
+            self._close_paragraph()  # an open <p> ends where the next one starts
+            self._current = []
+        elif tag in ("script", "style"):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "p":
+            self._close_paragraph()
+        elif tag in ("script", "style") and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+
+
+class ParagraphText:
+    """
+    Incremental <p> text extraction. feed() pieces of a page as they arrive
+    until it returns True (enough text collected, or unparseable markup),
+    then call close() for the joined text, truncated to `limit` chars.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.done = False
+        self._parser = _ParagraphParser(limit)
+        self._failed = False
+
+    def feed(self, html: str) -> bool:
+        if not self.done:
+            try:
+                self._parser.feed(html)
+            except _EnoughText:
+                self.done = True
+            except Exception:
+                self.done = self._failed = True
+        return self.done
+
+    def close(self) -> str:
+        if not self.done:
+            try:
+                self._parser.close()
+                self._parser._close_paragraph()  # a <p> left open at the end of the page
+            except _EnoughText:
+                pass
+            except Exception:
+                self._failed = True
+            self.done = True
+        return "" if self._failed else " ".join(self._parser.paragraphs)[:self.limit]
+
+
+def extract_paragraphs(html: str, limit: int = 3000, chunk_size: int = 16384) -> str:
+    """
+    Join the text of all <p> elements in a page, truncated to `limit` chars.
+    The page is parsed incrementally and parsing stops as soon as enough
+    paragraph text has been collected.
+    """
+    extractor = ParagraphText(limit)
+    for start in range(0, len(html), chunk_size):
+        if extractor.feed(html[start:start + chunk_size]):
+            break
+    return extractor.close()
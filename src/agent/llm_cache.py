@@ -0,0 +1,193 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from src.agent import config, metrics
+from src.agent.ratelimit import get_limiter
+from src.cache import TTLCache
+
+
+def cache_key(model: str, temperature, prompt: str) -> str:
+    """Stable key for one LLM call: model name, temperature and exact prompt text."""
+    raw = f"{model}\x00{temperature}\x00{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ── Cache backends ─────────────────────────────────────────────────────────────
+class ResponseCache:
+    """Interface for LLM response caches. Subclasses implement get/set."""
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU tier."""
+
+    def __init__(self, maxsize: int = 256):
+        self._lru = TTLCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self._lru.get(key)
+
+    def set(self, key, value):
+        self._lru.set(key, value)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Persistent tier in a SQLite file. Entries older than `ttl` seconds are
+    ignored, and only the `max_entries` most recently used rows are kept.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                value       TEXT NOT NULL,
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, value, now, now)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+
+class TieredResponseCache(ResponseCache):
+    """Check tiers in order; a hit in a lower tier is copied into the ones above it."""
+
+    def __init__(self, *tiers: ResponseCache):
+        self.tiers = tiers
+
+    def get(self, key):
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:i]:
+                    upper.set(key, value)
+                return value
+        return None
+
+    def set(self, key, value):
+        for tier in self.tiers:
+            tier.set(key, value)
+
+
+# ── Shared cache ───────────────────────────────────────────────────────────────
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache (memory LRU over SQLite by default)."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = TieredResponseCache(
+                MemoryResponseCache(config.LLM_CACHE_MEMORY_SIZE),
+                SQLiteResponseCache(
+                    os.path.join(config.CACHE_DIR, "llm_responses.sqlite3"),
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    ttl=config.LLM_CACHE_TTL,
+                ),
+            )
+        return _response_cache
+
+
+def set_response_cache(cache: ResponseCache):
+    """Swap in a different cache implementation (e.g. a shared or no-op backend)."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = cache
+
+
+def _call_llm(llm, prompt: str, on_token=None) -> str:
+    """
+    One timed LLM call. With `on_token`, the reply is streamed and each text
+    chunk is passed to it as it arrives; time to first token is recorded.
+    """
+    get_limiter("llm").acquire()
+    start = time.perf_counter()
+    if on_token is None:
+        reply = llm.invoke(prompt)
+    else:
+        reply = None
+        for chunk in llm.stream(prompt):
+            if reply is None:
+                metrics.record(ttft_s=round(time.perf_counter() - start, 4))
+            reply = chunk if reply is None else reply + chunk
+            if chunk.content:
+                on_token(chunk.content)
+    metrics.record(llm_s=round(time.perf_counter() - start, 4))
+    metrics.record_usage(reply)
+    return reply.content if reply is not None else ""
+
+
+def cached_invoke(llm, prompt: str, use_cache: bool = True, on_token=None, validate=None):
+    """
+    Invoke `llm` on `prompt`, serving identical earlier calls from the cache.
+    Returns (content, from_cache). With use_cache=False the cache is neither
+    read nor written. `on_token` receives the reply incrementally (a cached
+    reply arrives as a single chunk). With `validate`, only replies for which
+    validate(content) is true are cached or served from the cache, so a
+    malformed reply is retried next time instead of replayed.
+    """
+    if not use_cache:
+        return _call_llm(llm, prompt, on_token), False
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    key = cache_key(model, getattr(llm, "temperature", None), prompt)
+    cache = get_response_cache()
+    content = cache.get(key)
+    if content is not None and (validate is None or validate(content)):
+        metrics.record(cache_hits=1)
+        if on_token is not None:
+            on_token(content)
+        return content, True
+    content = _call_llm(llm, prompt, on_token)
+    if validate is None or validate(content):
+        cache.set(key, content)
+    return content, False
@@ -0,0 +1,103 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+from src.agent import config
+
+COUNTERS = (
+    "bytes_downloaded",
+    "pages_fetched",
+    "pages_failed",
+    "pages_skipped",
+    "prompt_tokens",
+    "completion_tokens",
+    "cache_hits",
+    "duplicates_dropped",
+)
+TIMINGS = ("llm_s", "ttft_s")  # LLM latency and time to first token; 0 when no call was made
+
+# Metrics of the node currently running in this thread / context
+_current = ContextVar("node_metrics", default=None)
+_trace_lock = threading.Lock()
+
+
+def record(**counts):
+    """Add to the counters of the running node. A no-op outside an instrumented node."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    for name, value in counts.items():
+        metrics[name] = metrics.get(name, 0) + value
+
+
+def record_usage(message):
+    """Record prompt/completion token counts from an LLM reply's usage_metadata."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    record(
+        prompt_tokens=usage.get("input_tokens", 0),
+        completion_tokens=usage.get("output_tokens", 0),
+    )
+
+
+def instrument(name: str, node):
+    """
+    Wrap a graph node so each call appends a metrics dict to state["metrics"]:
+    wall time plus the COUNTERS that the node and the helpers it calls
+    report through record().
+    """
+    @functools.wraps(node)
+    def wrapper(state: dict) -> dict:
+        metrics = {"node": name, "started": time.time(), "wall_s": 0.0}
+        metrics.update(dict.fromkeys(TIMINGS, 0.0))
+        metrics.update(dict.fromkeys(COUNTERS, 0))
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            state = node(state)
+        finally:
+            metrics["wall_s"] = round(time.perf_counter() - start, 4)
+            _current.reset(token)
+        state["metrics"] = list(state.get("metrics") or []) + [metrics]
+        return state
+    return wrapper
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def totals(metrics: list) -> dict:
+    """Sum the per-node metrics of one run."""
+    out = dict.fromkeys(COUNTERS, 0)
+    out["wall_s"] = out["llm_s"] = 0.0
+    for m in metrics:
+        for key in out:
+            out[key] += m.get(key, 0)
+    out["wall_s"] = round(out["wall_s"], 4)
+    out["llm_s"] = round(out["llm_s"], 4)
+    # Time from the start of the run to the first streamed LLM token
+    first = next((m for m in metrics if m.get("ttft_s")), None)
+    out["ttft_s"] = round(first["started"] - metrics[0]["started"] + first["ttft_s"], 4) if first else 0.0
+    return out
+
+
+def trace_lines(state: dict) -> str:
+    """The run's trace as JSON lines: one record per node, tagged with run id and query."""
+    lines = []
+    for m in state.get("metrics") or []:
+        lines.append(json.dumps({"run_id": state.get("run_id"), "query": state.get("query"), **m}))
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def export_trace(state: dict, path: str = None):
+    """Append the run's trace to `path` (default: RS_TRACE_FILE). Does nothing if unset."""
+    path = path or config.TRACE_FILE
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _trace_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(trace_lines(state))
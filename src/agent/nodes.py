@@ -1,28 +1,67 @@
+import functools
+import json
 import os
-import httpx
-from bs4 import BeautifulSoup
-from ddgs import DDGS
 from langchain_groq import ChatGroq
+from langgraph.config import get_stream_writer
+
+from src.agent import config, metrics
+from src.agent.dedup import NearDuplicateFilter
+from src.agent.fetcher import get_engine
+from src.agent.html_text import extract_paragraphs
+from src.agent.llm_cache import cached_invoke
+from src.agent.page_cache import PageCache, get_page_cache
+from src.agent.search import web_search
+from src.agent.urls import canonical_url
+from src.feature_extraction import score_relevance
 
 # ── LLM Setup ──────────────────────────────────────────────────────────────────
+_llm_override = None
+
+
 def get_llm():
     """Load Groq LLM. Reads API key from Streamlit secrets or environment."""
+    if _llm_override is not None:
+        return _llm_override
     try:
         import streamlit as st
         api_key = st.secrets["GROQ_API_KEY"]
     except Exception:
         api_key = os.getenv("GROQ_API_KEY", "")
+    return _llm_client(api_key)
+
+
+@functools.lru_cache(maxsize=4)
+def _llm_client(api_key: str):
+    # One client (and connection pool) per API key, shared by every node and run
     return ChatGroq(model="llama-3.3-70b-versatile", api_key=api_key, temperature=0.3)
 
 
+def set_llm(llm):
+    """Use `llm` instead of Groq for every node (None restores Groq)."""
+    global _llm_override
+    _llm_override = llm
+
+
+def _token_sink(state: dict, node: str):
+    """
+    Callback that forwards LLM tokens to the graph's "custom" stream, or
+    None when the run did not ask for token streaming.
+    """
+    if not state.get("stream_tokens"):
+        return None
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:  # called outside a graph run
+        return None
+    return lambda text: writer({"node": node, "token": text})
+
+
 # ── Node 1: Web Search ─────────────────────────────────────────────────────────
 def search_node(state: dict) -> dict:
-    """Search the web using DuckDuckGo. No API key required."""
+    """Search the web using DuckDuckGo (cached, coalesced). No API key required."""
     state["status"] = "Searching the web..."
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(state["query"], max_results=6))
-        state["search_results"] = results
+        state["search_results"] = web_search(state["query"], max_results=config.SEARCH_RESULTS)
     except Exception as e:
         state["search_results"] = []
         state["error"] = f"Search failed: {str(e)}"
@@ -31,56 +70,190 @@ def search_node(state: dict) -> dict:
 
 # ── Node 2: Retrieve Page Content ─────────────────────────────────────────────
 def retrieve_node(state: dict) -> dict:
-    """Fetch and parse full text from each search result URL."""
+    """
+    Fetch and parse full text from the search result URLs.
+    Fresh pages come straight from the page cache; stale ones are revalidated
+    with a conditional request. Everything else is fetched concurrently under
+    a shared deadline and checked as it arrives: once CANDIDATE_SOURCES usable
+    sources are in hand the remaining fetches are cancelled. If the target is
+    not reached, pages that ran out of time fall back to their cached text.
+    Sources left without page text get their DuckDuckGo snippet at the end;
+    snippets never count towards the target.
+    """
     state["status"] = "Retrieving source content..."
-    texts = []
-    for result in state["search_results"]:
+    results = state["search_results"]
+    try:
+        cache = get_page_cache()
+    except Exception:
+        cache = None  # e.g. RS_CACHE_DIR not writable: fetch everything
+    target = max(config.CANDIDATE_SOURCES, config.TARGET_SOURCES)  # validate picks the best of these
+
+    by_url, cached, to_fetch, conditional = {}, {}, [], {}
+    canonical = set()
+    for result in results:
         url = result.get("href", "")
-        title = result.get("title", "")
-        snippet = result.get("body", "")
+        key = canonical_url(url) if url else ""
+        if key in canonical:
+            continue  # same page under another link (tracking params, www., http)
+        canonical.add(key)
+        by_url[url] = result
+        entry = _cache_op(cache, "lookup", url) if url else None
+        if entry is not None:
+            cached[url] = entry
+        if entry is None or not entry["fresh"]:
+            to_fetch.append(url)
+            if entry is not None:
+                conditional[url] = PageCache.conditional_headers(entry)
+
+    texts, source_filter = [], _SourceFilter()
+    usable = 0
+    fallbacks = []  # URLs without usable page text; their snippets are added last
+
+    def add(url, page):
+        nonlocal usable
+        result = by_url[url]
+        full_text = _resolve_page_text(cache, url, cached.get(url), page)
+        if len(full_text) <= 200:
+            fallbacks.append(url)
+            return
+        item = {"url": url, "title": result.get("title", ""), "text": full_text}
+        texts.append(item)
+        usable += source_filter.accept(item)
+
+    # Fresh cache hits need no network and count towards the target first
+    for url in by_url:
+        if url not in to_fetch:
+            add(url, None)
+
+    pending = [u for u in to_fetch if u]
+    fetched = failed = 0
+    if usable < target and pending:
+        stream = get_engine().iter_fetch(pending, headers=conditional)
         try:
-            resp = httpx.get(url, timeout=8, follow_redirects=True,
-                             headers={"User-Agent": "Mozilla/5.0"})
-            soup = BeautifulSoup(resp.text, "html.parser")
-            paragraphs = soup.find_all("p")
-            full_text = " ".join(p.get_text() for p in paragraphs)[:3000]
-            text = full_text if len(full_text) > 200 else snippet
-        except Exception:
-            # Fallback to DuckDuckGo snippet if fetch fails
-            text = snippet
-        texts.append({"url": url, "title": title, "text": text})
+            for page in stream:
+                pending.remove(page["url"])
+                if page["ok"]:
+                    fetched += 1
+                    metrics.record(bytes_downloaded=page.get("bytes", 0))
+                else:
+                    failed += 1
+                add(page["url"], page)
+                if usable >= target:
+                    break
+        finally:
+            stream.close()  # cancels whatever is still in flight
+
+    if usable >= target:
+        metrics.record(pages_skipped=len(pending))  # cancelled or never started
+    else:
+        failed += len(pending)  # deadline passed before these arrived
+        for url in to_fetch:
+            if url in pending or not url:
+                add(url, None)
+    # Snippets never count towards the target: a page of real text beats them
+    for url in fallbacks:
+        result = by_url[url]
+        texts.append({"url": url, "title": result.get("title", ""), "text": result.get("body", "")})
+    metrics.record(pages_fetched=fetched, pages_failed=failed)
     state["retrieved_texts"] = texts
     return state
 
 
+def _cache_op(cache, method: str, *args):
+    """Call one page-cache method; a broken cache or odd URL only costs that URL its entry."""
+    try:
+        return getattr(cache, method)(*args)
+    except Exception:
+        return None
+
+
+def _resolve_page_text(cache: PageCache, url: str, entry, page) -> str:
+    """Pick the extracted text for one URL from the cache entry and/or fetch result."""
+    if entry is not None and entry["fresh"]:
+        metrics.record(cache_hits=1)
+        return entry["text"]
+    if page and page["ok"]:
+        if page["status"] == 304 and entry is not None:
+            metrics.record(cache_hits=1)
+            _cache_op(cache, "touch", url)
+            return entry["text"]
+        if "paragraphs" in page:
+            full_text = page["paragraphs"]  # extracted by the fetcher while downloading
+        elif page.get("content_type") == "text/plain":
+            full_text = " ".join(page["text"].split())[:config.PAGE_TEXT_CHARS]
+        else:
+            full_text = extract_paragraphs(page["text"], config.PAGE_TEXT_CHARS)
+        if page["status"] == 200:
+            _cache_op(cache, "store", url, full_text, page["etag"], page["last_modified"])
+        return full_text
+    # Network failure or deadline: a stale copy still beats the snippet
+    return entry["text"] if entry is not None else ""
+
+
 # ── Node 3: Validate Sources ───────────────────────────────────────────────────
+class _SourceFilter:
+    """
+    Accepts sources with more than MIN_SOURCE_CHARS of text whose canonical
+    URL and content have not been seen yet. Near-duplicate content (mirrors,
+    syndicated copies) is detected with MinHash at DEDUP_THRESHOLD.
+    """
+
+    def __init__(self):
+        self.seen_urls = set()
+        self.near_duplicates = NearDuplicateFilter()
+        self.dropped = 0
+
+    def accept(self, item: dict) -> bool:
+        text = item.get("text", "").strip()
+        if len(text) <= config.MIN_SOURCE_CHARS:
+            return False
+        url = canonical_url(item["url"]) if item.get("url") else ""
+        if url in self.seen_urls or not self.near_duplicates.add(text):
+            self.dropped += 1
+            return False
+        self.seen_urls.add(url)
+        return True
+
+
 def validate_node(state: dict) -> dict:
-    """Filter out empty, duplicate, or low-quality sources."""
+    """
+    Filter out empty, duplicate, near-duplicate or low-quality sources, then
+    keep the TARGET_SOURCES most relevant to the query (TF-IDF cosine).
+    Sources scoring under MIN_RELEVANCE are dropped unless none score higher.
+    """
     state["status"] = "Validating sources..."
-    valid = []
-    seen_urls = set()
-    for item in state["retrieved_texts"]:
-        url = item.get("url", "")
-        text = item.get("text", "")
-        is_unique = url not in seen_urls
-        has_content = len(text.strip()) > 100
-        if is_unique and has_content:
-            valid.append(item)
-            seen_urls.add(url)
-    state["validated_sources"] = valid[:5]  # Keep top 5 sources
+    source_filter = _SourceFilter()
+    valid = [item for item in state["retrieved_texts"] if source_filter.accept(item)]
+    metrics.record(duplicates_dropped=source_filter.dropped)
+
+    scores = score_relevance(state["query"], [f"{s['title']} {s['text']}" for s in valid])
+    for item, score in zip(valid, scores):
+        item["relevance"] = round(float(score), 4)
+    ranked = sorted(valid, key=lambda s: s["relevance"], reverse=True)  # stable for ties
+    relevant = [s for s in ranked if s["relevance"] >= config.MIN_RELEVANCE] or ranked
+    selected = relevant[:config.TARGET_SOURCES]
+
+    chosen = {id(s) for s in selected}
+    state["source_scores"] = [
+        {"title": s["title"], "url": s["url"], "relevance": s["relevance"], "selected": id(s) in chosen}
+        for s in ranked
+    ]
+    state["validated_sources"] = selected
     return state
 
 
+def _format_sources(sources: list) -> str:
+    """Source titles and the first 1200 chars of their text, as pasted into LLM prompts."""
+    return "\n\n".join(f"Source: {s['title']}\n{s['text'][:1200]}" for s in sources)
+
+
 # ── Node 4: Summarize with LLM ─────────────────────────────────────────────────
 def summarize_node(state: dict) -> dict:
     """Send validated source content to Groq LLM for summarization."""
     state["status"] = "Summarizing with LLM..."
     try:
         llm = get_llm()
-        combined = "\n\n".join(
-            f"Source: {s['title']}\n{s['text'][:1200]}"
-            for s in state["validated_sources"]
-        )
+        combined = _format_sources(state["validated_sources"])
         prompt = f"""You are a research assistant. Based on the following web sources, write a comprehensive summary about:
 
 "{state['query']}"
@@ -94,8 +267,11 @@ Instructions:
 - Do not hallucinate or add outside information
 - Be concise and academic in tone"""
 
-        response = llm.invoke(prompt)
-        state["llm_summary"] = response.content
+        content, from_cache = cached_invoke(
+            llm, prompt, state.get("use_cache", True), on_token=_token_sink(state, "summarize")
+        )
+        state["llm_summary"] = content
+        state.setdefault("llm_cached", {})["summarize"] = from_cache
     except Exception as e:
         state["llm_summary"] = (
             "LLM summarization failed. Please check your GROQ_API_KEY."
@@ -126,20 +302,18 @@ KEY FINDINGS:
 - [Finding 5]
 CONCLUSION: [2-3 sentence conclusion and implications]"""
 
-        response = llm.invoke(prompt)
-        state["report"] = _parse_report(
-            response.content, state["query"], state["validated_sources"]
+        content, from_cache = cached_invoke(
+            llm, prompt, state.get("use_cache", True), on_token=_token_sink(state, "report")
         )
+        state["report"] = _parse_report(content, state["query"], state["validated_sources"])
+        state.setdefault("llm_cached", {})["report"] = from_cache
     except Exception as e:
         state["report"] = {
             "title": state["query"],
             "abstract": state.get("llm_summary", ""),
             "key_findings": ["Report generation failed — see raw summary tab."],
             "conclusion": "An error occurred during report generation.",
-            "sources": [
-                {"title": s.get("title", "Source"), "url": s.get("url", "")}
-                for s in state["validated_sources"]
-            ],
+            "sources": _cite(state["validated_sources"]),
         }
         state["error"] = f"Report node error: {str(e)}"
 
@@ -147,7 +321,64 @@ CONCLUSION: [2-3 sentence conclusion and implications]"""
     return state
 
 
+# ── Node 4b: Summary + Report in One Call ─────────────────────────────────────
+def structured_node(state: dict) -> dict:
+    """
+    Fast path: ask the LLM for the summary and the structured report as one
+    JSON object. If the reply does not match the schema, state["report"] is
+    left empty and the graph falls back to summarize → report.
+    """
+    state["status"] = "Writing report with LLM..."
+    try:
+        llm = get_llm()
+        prompt = f"""You are a research assistant. Using only the web sources below, research:
+
+"{state['query']}"
+
+Sources:
+{_format_sources(state["validated_sources"])}
+
+Respond with a single JSON object and nothing else, with exactly these keys:
+{{
+  "summary": "3 to 5 clear, factual paragraphs separated by blank lines",
+  "title": "A descriptive research title",
+  "abstract": "2-3 sentence overview of the topic and findings",
+  "key_findings": ["Finding 1", "Finding 2", "Finding 3", "Finding 4", "Finding 5"],
+  "conclusion": "2-3 sentence conclusion and implications"
+}}
+
+Instructions:
+- Only use information found in the sources above
+- Do not hallucinate or add outside information
+- Be concise and academic in tone"""
+
+        sources = state["validated_sources"]
+        content, from_cache = cached_invoke(
+            llm, prompt, state.get("use_cache", True),
+            validate=lambda reply: _parse_structured_report(reply, sources) is not None,
+        )
+        state.setdefault("llm_cached", {})["structured"] = from_cache
+        parsed = _parse_structured_report(content, sources)
+    except Exception:
+        parsed = None
+    if parsed is None:
+        state["report"] = {}
+        return state
+
+    state["llm_summary"], state["report"] = parsed
+    state["status"] = "Complete"
+    return state
+
+
 # ── Internal: Parse LLM Report Output ────────────────────────────────────────
+def _cite(sources: list) -> list:
+    """Report citations: title, URL and query relevance of each source used."""
+    return [
+        {"title": s.get("title", "Source"), "url": s.get("url", ""), "relevance": s.get("relevance")}
+        for s in sources
+    ]
+
+
 def _parse_report(raw: str, query: str, sources: list) -> dict:
     """Parse the LLM's formatted text response into a structured dict."""
     report = {
@@ -155,10 +386,7 @@ def _parse_report(raw: str, query: str, sources: list) -> dict:
         "abstract": "",
         "key_findings": [],
         "conclusion": "",
-        "sources": [
-            {"title": s.get("title", "Source"), "url": s.get("url", "")}
-            for s in sources
-        ],
+        "sources": _cite(sources),
     }
     current_section = None
 
@@ -186,3 +414,44 @@ def _parse_report(raw: str, query: str, sources: list) -> dict:
             report["conclusion"] += (" " + line) if report["conclusion"] else line
 
     return report
+
+
+REPORT_SCHEMA = {
+    "summary": str,
+    "title": str,
+    "abstract": str,
+    "key_findings": list,
+    "conclusion": str,
+}
+
+
+def _parse_structured_report(raw: str, sources: list):
+    """
+    Validate the JSON reply of structured_node against REPORT_SCHEMA.
+    Returns (summary, report dict) or None if anything is missing or mistyped.
+    """
+    start, end = raw.find("{"), raw.rfind("}")  # tolerate code fences or stray prose
+    if start == -1 or end < start:
+        return None
+    try:
+        data = json.loads(raw[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    for key, kind in REPORT_SCHEMA.items():
+        value = data.get(key)
+        if not isinstance(value, kind) or not value:
+            return None
+    findings = [f.strip() for f in data["key_findings"] if isinstance(f, str) and f.strip()]
+    if not findings:
+        return None
+
+    report = {
+        "title": data["title"].strip(),
+        "abstract": data["abstract"].strip(),
+        "key_findings": findings,
+        "conclusion": data["conclusion"].strip(),
+        "sources": _cite(sources),
+    }
+    return data["summary"].strip(), report
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import threading
+import time
+
+from src.agent import config
+from src.agent.urls import normalize_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    text          TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL,
+    size          INTEGER NOT NULL
+)
+"""
+
+
+class PageCache:
+    """
+    On-disk cache of extracted page text, keyed by normalized URL.
+
+    Entries younger than `ttl` seconds are served directly. Older entries keep
+    their ETag / Last-Modified validators so the fetcher can revalidate them
+    with a conditional request. The total stored text is capped at `max_bytes`;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(self, url: str):
+        """Return {"text", "etag", "last_modified", "fresh"} for a cached URL, or None."""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+            self._conn.commit()
+        text, etag, last_modified, fetched_at = row
+        return {
+            "text": text,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl,
+        }
+
+    def store(self, url: str, text: str, etag=None, last_modified=None):
+        """Insert or replace the extracted text for a URL, then enforce the size cap."""
+        key = normalize_url(url)
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, text, etag, last_modified, now, now, size),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """Mark a cached entry fresh again after a 304 Not Modified response."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, normalize_url(url)),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        # Keep the most recently used entries whose running size fits the cap.
+        self._conn.execute(
+            """
+            DELETE FROM pages WHERE url IN (
+                SELECT url FROM (
+                    SELECT url, SUM(size) OVER (ORDER BY accessed_at DESC, url) AS running
+                    FROM pages
+                ) WHERE running > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for a stale entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+# ── Shared cache ───────────────────────────────────────────────────────────────
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide page cache, opening it on first use."""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache(
+                os.path.join(config.CACHE_DIR, "pages.sqlite3"),
+                ttl=config.PAGE_CACHE_TTL,
+                max_bytes=config.PAGE_CACHE_MAX_MB * 1024 * 1024,
+            )
+        return _page_cache
+
+
+def set_page_cache(cache: PageCache):
+    """Swap in a different page cache (e.g. one in a temporary directory)."""
+    global _page_cache
+    with _page_cache_lock:
+        _page_cache = cache
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from src.agent import config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second refill a bucket of
+    `capacity`, so short bursts pass immediately and sustained load is held
+    to `rate`. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1, timeout=None) -> bool:
+        """
+        Block until `tokens` are available and take them. Returns False if
+        that would take longer than `timeout` seconds.
+        """
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# ── Shared limiters ────────────────────────────────────────────────────────────
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+_LIMITS = {
+    "llm": (config.LLM_RATE_PER_MIN, config.LLM_RATE_BURST),
+    "search": (config.SEARCH_RATE_PER_MIN, config.SEARCH_RATE_BURST),
+}
+
+
+def get_limiter(name: str) -> TokenBucket:
+    """Process-wide limiter for one backend ("llm" or "search"), shared by all runs."""
+    with _limiters_lock:
+        if name not in _limiters:
+            per_min, burst = _LIMITS[name]
+            _limiters[name] = TokenBucket(per_min / 60.0, burst)
+        return _limiters[name]
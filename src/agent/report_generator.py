@@ -17,7 +17,11 @@ def format_report(state: dict) -> dict:
     for s in sources:
         if isinstance(s, dict):
             clean_sources.append(
-                {"title": s.get("title", "Untitled Source"), "url": s.get("url", "")}
+                {
+                    "title": s.get("title", "Untitled Source"),
+                    "url": s.get("url", ""),
+                    "relevance": s.get("relevance"),
+                }
             )
 
     return {
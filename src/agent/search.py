@@ -0,0 +1,84 @@
+import re
+import threading
+
+from ddgs import DDGS
+
+from src.agent import config, metrics
+from src.agent.ratelimit import get_limiter
+from src.cache import SingleFlight, TTLCache
+
+_cache = TTLCache(maxsize=config.SEARCH_CACHE_SIZE, ttl=config.SEARCH_CACHE_TTL)
+_flight = SingleFlight()
+_stats = {"requests": 0, "hits": 0, "coalesced": 0, "upstream_calls": 0, "upstream_errors": 0}
+_stats_lock = threading.Lock()
+_backend = None  # stand-in for DuckDuckGo, see set_search_backend()
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, collapse whitespace and drop surrounding punctuation."""
+    query = re.sub(r"\s+", " ", query.lower()).strip()
+    return query.strip(" ?!.,;:\"'")
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _upstream_search(query: str, max_results: int) -> list:
+    get_limiter("search").acquire()
+    _count("upstream_calls")
+    try:
+        if _backend is not None:
+            return list(_backend(query, max_results))
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+    except Exception:
+        _count("upstream_errors")
+        raise
+
+
+def web_search(query: str, max_results: int = 6) -> list:
+    """
+    DuckDuckGo text search with a normalized-query TTL cache.
+    Concurrent identical searches share one upstream call. Failures are
+    raised to every waiter and never cached.
+    """
+    _count("requests")
+    key = (normalize_query(query), max_results)
+    results = _cache.get(key)
+    if results is not None:
+        _count("hits")
+        metrics.record(cache_hits=1)
+        return list(results)
+
+    def run():
+        found = _upstream_search(query, max_results)
+        _cache.set(key, found)
+        return found
+
+    results, shared = _flight.do(key, run)
+    if shared:
+        _count("coalesced")
+        metrics.record(cache_hits=1)
+    return list(results)
+
+
+def search_stats() -> dict:
+    """Snapshot of cache counters, including the overall hit rate."""
+    with _stats_lock:
+        stats = dict(_stats)
+    served = stats["hits"] + stats["coalesced"]
+    stats["hit_rate"] = served / stats["requests"] if stats["requests"] else 0.0
+    stats["cached_queries"] = len(_cache)
+    return stats
+
+
+def set_search_backend(backend):
+    """
+    Replace DuckDuckGo with `backend(query, max_results) -> list of
+    {"title", "href", "body"}`, or restore it with None. Clears the cache.
+    """
+    global _backend
+    _backend = backend
+    _cache.clear()
@@ -0,0 +1,339 @@
+"""
+Headless research service: a job queue in front of the research graph.
+
+    python -m src.agent.service --port 8765 --workers 2 --queue 32
+    python -m src.agent.service --fake      # stand-in backends, no network or API key
+
+HTTP API (JSON):
+    POST /jobs                  {"query", "use_cache"?, "single_call"?} -> 202 {"job_id", "status", "coalesced"}
+                                503 with Retry-After when the queue is full
+    GET  /jobs/<id>             job status, and the result once finished
+    GET  /jobs/<id>/events      progress events as JSON lines, streamed until the job ends
+                                (?since=N starts at event number N); token events are
+                                dropped once the job ends, the result holds the full text
+    GET  /health                queue depth, worker count and job counters
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.agent import config
+from src.agent.graph import stream_research_agent
+from src.agent.metrics import totals
+from src.agent.search import normalize_query
+from src.cache import TTLCache
+
+MAX_BODY_BYTES = 64 * 1024  # a job request is a query and two flags
+
+
+class QueueFull(Exception):
+    """Raised by ResearchService.submit() when no more jobs can be queued."""
+
+
+class Job:
+    """One research run: its status, progress events and final result."""
+
+    def __init__(self, query: str, options: dict, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.query = query
+        self.options = options
+        self.key = key
+        self.status = "queued"
+        self.events = []
+        self.next_seq = 0  # number of the next event; events keep their numbers when compacted
+        self.result = None
+        self.error = None
+        self.subscribers = 1
+        self.created = time.time()
+        self.started = self.finished = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def _append(self, kind: str, at: float, **data):
+        self.events.append({"seq": self.next_seq, "type": kind, "time": at, **data})
+        self.next_seq += 1
+        self._cond.notify_all()
+
+    def publish(self, kind: str, **data):
+        with self._cond:
+            self._append(kind, time.time(), **data)
+
+    def finish(self, status: str, result=None, error=None):
+        """Record the outcome and drop the token events; the result holds the text."""
+        with self._cond:
+            self.result, self.error = result, error
+            self.finished = time.time()
+            self.status = status
+            self.events = [e for e in self.events if e["type"] != "token"]
+            self._append(status, self.finished, error=error)
+
+    def wait_events(self, since: int = 0, timeout=None) -> list:
+        """Events numbered `since` and up, waiting up to `timeout` s for new ones."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.next_seq > since or self.done, timeout)
+            if self.done:
+                return [e for e in self.events if e["seq"] >= since]
+            return self.events[since:]  # numbers match list positions until finish()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "job_id": self.id,
+                "query": self.query,
+                "status": self.status,
+                "subscribers": self.subscribers,
+                "events": self.next_seq,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "error": self.error,
+                "result": self.result,
+            }
+
+
+class ResearchService:
+    """
+    Runs research jobs on a fixed pool of worker threads fed by a bounded
+    queue. submit() raises QueueFull instead of letting work pile up, and a
+    query identical to one still queued or running joins that job instead of
+    starting another. Finished jobs stay pollable for `job_ttl` seconds.
+    """
+
+    def __init__(self, workers: int = None, max_queue: int = None, job_ttl: float = None,
+                 runner=stream_research_agent):
+        self.workers = max(1, workers or config.SERVICE_WORKERS)
+        self.max_queue = max(1, max_queue or config.SERVICE_QUEUE_SIZE)
+        self._runner = runner
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._jobs = TTLCache(maxsize=10_000, ttl=job_ttl or config.SERVICE_JOB_TTL)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._counts = {"submitted": 0, "coalesced": 0, "rejected": 0, "done": 0, "failed": 0}
+        self._running = 0
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"research-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """Let the workers finish queued jobs, then stop them."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # ── Client side ────────────────────────────────────────────────────────────
+    def submit(self, query: str, use_cache: bool = True, single_call: bool = None):
+        """Queue a research run. Returns (job, coalesced); raises QueueFull or ValueError."""
+        query = query.strip()
+        if not query:
+            raise ValueError("Empty query")
+        key = (normalize_query(query), use_cache, single_call)
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                job.subscribers += 1
+                self._counts["coalesced"] += 1
+                return job, True
+            self._jobs.purge()  # finished jobs nobody polls again would otherwise linger
+            job = Job(query, {"use_cache": use_cache, "single_call": single_call}, key)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._counts["rejected"] += 1
+                raise QueueFull(f"Job queue is full ({self.max_queue} waiting)") from None
+            self._inflight[key] = job
+            self._jobs.set(job.id, job)
+            self._counts["submitted"] += 1
+        job.publish("queued")
+        return job, False
+
+    def get(self, job_id: str):
+        """The Job with this id, or None if unknown or expired."""
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._queue.qsize(),
+                "running": self._running,
+                **self._counts,
+            }
+
+    # ── Worker side ────────────────────────────────────────────────────────────
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                self._running += 1
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+    def _run(self, job: Job):
+        job.status, job.started = "running", time.time()
+        job.publish("running")
+        final_state, status, error = None, "done", None
+        try:
+            for kind, payload in self._runner(job.query, stream_tokens=True, **job.options):
+                if kind == "token":
+                    job.publish("token", node=payload["node"], token=payload["token"])
+                    continue
+                for node, state in payload.items():
+                    final_state = state
+                    node_metrics = (state.get("metrics") or [None])[-1]
+                    job.publish("update", node=node, status=state.get("status"), metrics=node_metrics)
+        except Exception as e:
+            status, error = "failed", str(e)
+
+        result = None
+        if final_state is not None and status == "done":
+            result = {
+                "run_id": final_state.get("run_id"),
+                "report": final_state.get("report", {}),
+                "llm_summary": final_state.get("llm_summary", ""),
+                "warning": final_state.get("error"),
+                "metrics": totals(final_state.get("metrics") or []),
+            }
+        # New identical submissions start a fresh job from here on
+        with self._lock:
+            self._inflight.pop(job.key, None)
+            self._counts[status] += 1
+        job.finish(status, result, error)
+        self._jobs.set(job.id, job)  # finished jobs stay pollable for the full TTL
+
+
+# ── HTTP front end ─────────────────────────────────────────────────────────────
+def make_server(service: ResearchService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """A threaded HTTP server exposing `service` (see the module docstring)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: dict, headers=None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/jobs":
+                return self._send_json(404, {"error": "Not found"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length < 0:
+                    raise ValueError("Invalid Content-Length")
+                if length > MAX_BODY_BYTES:
+                    return self._send_json(413, {"error": f"Request body over {MAX_BODY_BYTES} bytes"})
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("Request body must be a JSON object")
+                query = body.get("query", "")
+                use_cache, single_call = body.get("use_cache", True), body.get("single_call")
+                if not isinstance(query, str):
+                    raise ValueError("query must be a string")
+                if not isinstance(use_cache, bool):
+                    raise ValueError("use_cache must be true or false")
+                if single_call is not None and not isinstance(single_call, bool):
+                    raise ValueError("single_call must be true, false or null")
+                job, coalesced = service.submit(query, use_cache=use_cache, single_call=single_call)
+            except QueueFull as e:
+                return self._send_json(503, {"error": str(e)}, {"Retry-After": "5"})
+            except ValueError as e:
+                return self._send_json(400, {"error": str(e)})
+            self._send_json(202, {"job_id": job.id, "status": job.status, "coalesced": coalesced},
+                            {"Location": f"/jobs/{job.id}"})
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            if parts == ["health"]:
+                return self._send_json(200, service.stats())
+            if len(parts) < 2 or parts[0] != "jobs":
+                return self._send_json(404, {"error": "Not found"})
+            job = service.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "Unknown job"})
+            if len(parts) == 2:
+                return self._send_json(200, job.snapshot())
+            if parts[2:] == ["events"]:
+                try:
+                    since = int(parse_qs(url.query).get("since", ["0"])[0])
+                except ValueError:
+                    return self._send_json(400, {"error": "since must be an integer"})
+                if since < 0:
+                    return self._send_json(400, {"error": "since must not be negative"})
+                return self._stream_events(job, since)
+            self._send_json(404, {"error": "Not found"})
+
+        def _stream_events(self, job: Job, since: int):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            try:
+                while True:
+                    events = job.wait_events(since, timeout=15)
+                    for event in events:
+                        self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                    if events:
+                        since = events[-1]["seq"] + 1
+                    if job.done and since >= job.next_seq:
+                        return
+            except (BrokenPipeError, ConnectionResetError):
+                return  # client went away; the job keeps running
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the research agent over HTTP with a job queue.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=config.SERVICE_WORKERS)
+    parser.add_argument("--queue", type=int, default=config.SERVICE_QUEUE_SIZE, help="max queued jobs")
+    parser.add_argument("--fake", action="store_true",
+                        help="use stand-in search, HTTP and LLM backends (no network, no API key)")
+    parser.add_argument("--fake-latency", type=float, default=0.5,
+                        help="seconds each stand-in page fetch and LLM call takes")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        from src.agent.fakes import install_fake_backends
+        install_fake_backends(latency=args.fake_latency)
+    service = ResearchService(workers=args.workers, max_queue=args.queue).start()
+    server = make_server(service, args.host, args.port)
+    print(f"Research service on http://{args.host}:{args.port} "
+          f"({service.workers} workers, queue {service.max_queue}{', fake backends' if args.fake else ''})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,14 @@ class ResearchState(TypedDict):
     search_results: list              # raw DuckDuckGo results
     retrieved_texts: list             # fetched page content per source
     validated_sources: list           # filtered, quality-checked sources
+    source_scores: list               # every valid candidate's query relevance and whether it was kept
     llm_summary: str                  # LLM-generated summary
     report: dict                      # final structured report
     status: str                       # current step (for UI status indicator)
     error: Optional[str]              # error message if any step fails
+    use_cache: bool                   # allow LLM responses to be served from cache
+    stream_tokens: bool               # emit LLM tokens on the graph's "custom" stream
+    single_call: bool                 # try the one-call JSON summary + report first
+    llm_cached: dict                  # node name -> whether its LLM reply came from cache
+    run_id: str                       # identifies this run in exported traces
+    metrics: list                     # one timing/counter dict per executed node
@@ -0,0 +1,51 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share one cache key:
+    lower-cased scheme and host, no default port, no fragment, sorted query
+    parameters and no trailing slash on the path.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port  # raises ValueError for a non-numeric or out-of-range port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+# Query parameters that track the visitor rather than select content
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "dclid", "igshid", "mc_cid", "mc_eid",
+                   "ref", "ref_src", "spm", "_ga", "yclid"}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Identity of the page behind a URL, for spotting the same article under
+    different links: normalize_url() plus no tracking parameters, no "www."
+    and http/https treated alike.
+    """
+    url = normalize_url(url)
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ])
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, parts.path, query, ""))
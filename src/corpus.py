@@ -0,0 +1,29 @@
+CORPUS_MODES = ("combined", "document", "chunk")
+
+
+def build_corpus(documents, mode="combined", chunk_words=500):
+    """
+    Turn loaded documents into the rows used for TF-IDF and LDA.
+    documents: list of {"name", "text"} dicts (as from load_uploaded_files)
+    mode:
+      "combined" – one row with every document joined (the original behaviour)
+      "document" – one row per document
+      "chunk"    – one row per `chunk_words` words of each document
+    Returns: (row_names, row_texts)
+    """
+    if mode not in CORPUS_MODES:
+        raise ValueError(f"Unknown corpus mode: {mode!r}")
+
+    if mode == "combined":
+        return ["All documents"], ["\n\n".join(d["text"] for d in documents)]
+
+    if mode == "document":
+        return [d["name"] for d in documents], [d["text"] for d in documents]
+
+    names, texts = [], []
+    for d in documents:
+        words = d["text"].split()
+        for n, start in enumerate(range(0, len(words), chunk_words), 1):
+            names.append(f"{d['name']} #{n}")
+            texts.append(" ".join(words[start:start + chunk_words]))
+    return names, texts
@@ -1,18 +1,155 @@
 import PyPDF2
+import hashlib
 import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
-def load_pdf(file) -> str:
-    """Extract text from an uploaded PDF file object."""
-    text = []
+from src.agent.config import CACHE_DIR, PDF_TEXT_CACHE_MAX_MB
+
+# PDFs with fewer pages than this are extracted in-process; pool start-up
+# would cost more than it saves.
+PDF_PARALLEL_MIN_PAGES = 8
+PDF_TEXT_CACHE_DIR = os.path.join(CACHE_DIR, "pdf_text")
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _pools[workers]
+
+
+def _discard_pool(workers, pool):
+    """Forget a pool whose worker died; the next _get_pool() starts a fresh one."""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(path: str, start: int, end: int) -> list:
+    """Worker: extract text for pages [start, end) of the PDF at `path`."""
+    reader = PyPDF2.PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _cache_path(digest: str) -> str:
+    return os.path.join(PDF_TEXT_CACHE_DIR, f"{digest}.txt")
+
+
+def _read_cached_text(digest: str):
+    try:
+        with open(_cache_path(digest), encoding="utf-8") as f:
+            text = f.read()
+        os.utime(_cache_path(digest))  # mtime doubles as last-used time for eviction
+        return text
+    except OSError:
+        return None
+
+
+def _write_cached_text(digest: str, text: str):
     try:
-        reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text.append(page_text)
+        os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+        tmp = _cache_path(digest) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, _cache_path(digest))
+        _evict_cached_text()
+    except OSError:
+        pass  # caching is best-effort
+
+
+def _evict_cached_text():
+    """Delete the least recently used cached texts until the rest fit PDF_TEXT_CACHE_MAX_MB."""
+    entries = []
+    for entry in os.scandir(PDF_TEXT_CACHE_DIR):
+        if entry.name.endswith(".txt"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    budget = PDF_TEXT_CACHE_MAX_MB * 1024 * 1024
+    for _, size, path in sorted(entries, reverse=True):
+        budget -= size
+        if budget < 0:
+            os.remove(path)
+
+
+def _extract_parallel(path: str, total: int, workers: int, pages: list, progress=None):
+    """
+    Extract page ranges of the PDF at `path` on the shared pool. A pool broken
+    by a dead worker (e.g. OOM-killed) is replaced and the PDF retried once.
+    """
+    step = max(1, -(-total // (workers * 4)))  # ~4 ranges per worker
+    for attempt in range(2):
+        pool = _get_pool(workers)
+        try:
+            futures = {
+                pool.submit(_extract_page_range, path, start, min(start + step, total)): start
+                for start in range(0, total, step)
+            }
+            done = 0
+            for future in as_completed(futures):
+                start = futures[future]
+                chunk = future.result()
+                pages[start:start + len(chunk)] = chunk
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+            return
+        except BrokenProcessPool:
+            _discard_pool(workers, pool)
+            if attempt:
+                raise
+
+
+def load_pdf(file, workers=None, progress=None) -> str:
+    """
+    Extract text from an uploaded PDF file object.
+    Text is cached by a SHA-256 of the file content, so the same PDF is only
+    extracted once (the cache keeps the most recently used PDFs within
+    PDF_TEXT_CACHE_MAX_MB). Large PDFs are split into page ranges and extracted on a
+    process pool of `workers` processes (default: all cores).
+    progress: optional callback(done_pages, total_pages).
+    """
+    data = file.getvalue() if hasattr(file, "getvalue") else file.read()
+    digest = hashlib.sha256(data).hexdigest()
+    cached = _read_cached_text(digest)
+    if cached is not None:
+        if progress:
+            progress(1, 1)
+        return cached
+
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        total = len(reader.pages)
+        workers = workers or os.cpu_count() or 1
+        pages = [""] * total
+        if workers == 1 or total < PDF_PARALLEL_MIN_PAGES:
+            for i in range(total):
+                pages[i] = reader.pages[i].extract_text() or ""
+                if progress:
+                    progress(i + 1, total)
+        else:
+            # Workers read the PDF from a temp file instead of each task
+            # pickling the whole document.
+            fd, path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                _extract_parallel(path, total, workers, pages, progress)
+            finally:
+                os.remove(path)
     except Exception as e:
         return f"[Error reading PDF: {e}]"
-    return "\n".join(text)
+
+    text = "\n".join(p for p in pages if p)
+    _write_cached_text(digest, text)
+    return text
 
 def load_txt(file) -> str:
     """Read a plain text file object."""
@@ -21,17 +158,24 @@ def load_txt(file) -> str:
     except Exception as e:
         return f"[Error reading file: {e}]"
 
-def load_uploaded_files(uploaded_files) -> list[dict]:
+def load_uploaded_files(uploaded_files, workers=None, progress=None) -> list[dict]:
     """
     Process a list of Streamlit UploadedFile objects.
+    progress: optional callback(fraction, message) for a progress bar.
     Returns a list of dicts: {"name": filename, "text": raw_text}
     """
     documents = []
-    for uf in uploaded_files:
+    n_files = len(uploaded_files)
+    for k, uf in enumerate(uploaded_files):
         if uf.name.endswith(".pdf"):
-            text = load_pdf(uf)
+            def page_progress(done, total, k=k, name=uf.name):
+                if progress:
+                    progress((k + done / total) / n_files, f"Reading {name}: page {done}/{total}")
+            text = load_pdf(uf, workers=workers, progress=page_progress)
         else:
             text = load_txt(uf)
+        if progress:
+            progress((k + 1) / n_files, f"Read {uf.name}")
         if text.strip():
             documents.append({"name": uf.name, "text": text})
     return documents
@@ -1,10 +1,49 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from gensim.models import CoherenceModel
-def calculate_coherence(lda_model, texts, dictionary):
+
+COHERENCE_MEASURES = ("c_v", "u_mass")
+
+# Background scoring runs here so the UI can render everything else first
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="coherence")
+
+def calculate_coherence(lda_model, texts, dictionary, measure="c_v", corpus=None, processes=None):
+    """
+    Topic coherence of an LDA model.
+    measure="c_v"    – sliding-window co-occurrence over the tokenized texts,
+                       spread over `processes` worker processes
+                       (default: all cores but one).
+    measure="u_mass" – document co-occurrence counted straight from the BoW
+                       `corpus` (as returned by build_lda_model); much faster.
+    """
+    if measure not in COHERENCE_MEASURES:
+        raise ValueError(f"Unknown coherence measure: {measure!r}")
+
+    if measure == "u_mass":
+        if corpus is None:
+            corpus = [dictionary.doc2bow(text.split()) for text in texts]
+        coherence_model = CoherenceModel(
+            model=lda_model,
+            corpus=corpus,
+            dictionary=dictionary,
+            coherence='u_mass'
+        )
+        return coherence_model.get_coherence()
+
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 2) - 1)
     tokenized_texts = [text.split() for text in texts]
     coherence_model = CoherenceModel(
         model=lda_model,
         texts=tokenized_texts,
         dictionary=dictionary,
-        coherence='c_v'
+        coherence='c_v',
+        processes=processes
+    )
+    return coherence_model.get_coherence()
+
+def calculate_coherence_async(lda_model, texts, dictionary, measure="c_v", corpus=None, processes=None):
+    """Start calculate_coherence on a background thread; returns a concurrent.futures.Future."""
+    return _executor.submit(
+        calculate_coherence, lda_model, texts, dictionary, measure, corpus, processes
     )
-    return coherence_model.get_coherence()
\ No newline at end of file
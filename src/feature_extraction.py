@@ -1,6 +1,23 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-def build_tfidf(corpus):
-    vectorizer = TfidfVectorizer(max_df=1.0, min_df=1)
+import numpy as np
+def build_tfidf(corpus, stop_words=None, sublinear_tf=False):
+    vectorizer = TfidfVectorizer(max_df=1.0, min_df=1, stop_words=stop_words, sublinear_tf=sublinear_tf)
     tfidf_matrix = vectorizer.fit_transform(corpus)
     feature_names = vectorizer.get_feature_names_out()
-    return tfidf_matrix, feature_names, vectorizer
\ No newline at end of file
+    return tfidf_matrix, feature_names, vectorizer
+
+def score_relevance(query, documents):
+    """
+    Cosine similarity of `query` to every document, in a TF-IDF space fitted
+    on the documents (English stop words removed, sublinear tf). All
+    documents are scored in one sparse product; returns an array in [0, 1].
+    """
+    if not documents:
+        return np.zeros(0)
+    try:
+        tfidf_matrix, _, vectorizer = build_tfidf(documents, stop_words="english", sublinear_tf=True)
+    except ValueError:  # empty vocabulary: nothing but stop words
+        return np.zeros(len(documents))
+    query_vector = vectorizer.transform([query])
+    # Rows are L2-normalized, so the dot product is the cosine similarity
+    return (tfidf_matrix @ query_vector.T).toarray().ravel()
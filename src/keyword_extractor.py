@@ -1,7 +1,100 @@
+from itertools import islice
+
 import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+def _top_k_indices(scores, top_n):
+    """
+    Indices of the `top_n` highest scores, best first, with ties kept in index
+    order (the same order a stable descending sort would give). Uses
+    argpartition so only the candidates are ever sorted.
+    """
+    if top_n <= 0 or scores.size == 0:
+        return np.array([], dtype=np.intp)
+    if top_n < scores.size:
+        part = np.argpartition(-scores, top_n - 1)[:top_n]
+        candidates = np.flatnonzero(scores >= scores[part].min())
+    else:
+        candidates = np.arange(scores.size)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:top_n]
 
 def extract_keywords(tfidf_matrix, feature_names, top_n=15):
-    scores = np.sum(tfidf_matrix.toarray(), axis=0)
-    word_scores = list(zip(feature_names, scores))
-    sorted_words = sorted(word_scores, key=lambda x: x[1], reverse=True)
-    return sorted_words[:top_n]
\ No newline at end of file
+    # Column sums straight from the sparse matrix; no dense docs × vocab copy
+    scores = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+    top = _top_k_indices(scores, top_n)
+    return [(feature_names[i], scores[i]) for i in top]
+
+
+def extract_document_keywords(tfidf_matrix, feature_names, top_n=5):
+    """Top TF-IDF terms for each row (document) of a sparse matrix."""
+    tfidf_matrix = tfidf_matrix.tocsr()
+    results = []
+    for i in range(tfidf_matrix.shape[0]):
+        row = tfidf_matrix.getrow(i)
+        if row.nnz == 0:
+            results.append([])
+            continue
+        k = min(top_n, row.nnz)
+        top = np.argpartition(-row.data, k - 1)[:k]
+        top = top[np.argsort(-row.data[top], kind="stable")]
+        results.append([(feature_names[row.indices[j]], float(row.data[j])) for j in top])
+    return results
+
+
+# ── Streaming path for corpora that don't fit in memory ───────────────────────
+def _batches(docs, batch_size):
+    it = iter(docs)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def extract_keywords_streaming(make_docs, top_n=15, n_features=2 ** 20, batch_size=1000):
+    """
+    Corpus-level TF-IDF keywords without holding the corpus or a vocabulary.
+
+    make_docs: zero-argument callable returning a fresh iterable of processed
+               document strings (e.g. reading lines from a file). It is
+               iterated up to three times.
+    Documents are hashed into `n_features` buckets with HashingVectorizer and
+    processed `batch_size` at a time: pass 1 counts document frequencies,
+    pass 2 sums the smoothed, L2-normalised TF-IDF rows (the same weighting
+    as build_tfidf), and pass 3 maps the winning buckets back to words,
+    stopping as soon as all of them are named. Scores match extract_keywords
+    up to hash collisions; equal scores may come out in a different order.
+    """
+    hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+
+    n_docs = 0
+    df = np.zeros(n_features, dtype=np.int64)
+    for batch in _batches(make_docs(), batch_size):
+        counts = hasher.transform(batch)
+        df += np.bincount(counts.indices, minlength=n_features)
+        n_docs += len(batch)
+    if n_docs == 0:
+        return []
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+
+    scores = np.zeros(n_features)
+    for batch in _batches(make_docs(), batch_size):
+        weighted = hasher.transform(batch).multiply(idf).tocsr()
+        scores += np.asarray(normalize(weighted).sum(axis=0)).ravel()
+    scores[df == 0] = 0.0
+
+    top = [i for i in _top_k_indices(scores, top_n) if scores[i] > 0]
+    names = {}
+    analyzer = hasher.build_analyzer()
+    for batch in _batches(make_docs(), batch_size):
+        terms = sorted({t for doc in batch for t in analyzer(doc)})
+        if terms:
+            rows = hasher.transform(terms)
+            for r, term in enumerate(terms):
+                start, end = rows.indptr[r], rows.indptr[r + 1]
+                if end - start == 1:
+                    names.setdefault(rows.indices[start], term)
+        if all(i in names for i in top):
+            break
+    return [(names.get(i, f"<bucket {i}>"), scores[i]) for i in top]
@@ -0,0 +1,121 @@
+import hashlib
+import json
+from concurrent.futures import Future
+
+from src.agent import config
+from src.preprocessing import preprocess_corpus, get_text_stats
+from src.corpus import build_corpus
+from src.feature_extraction import build_tfidf
+from src.topic_model import build_lda_model, get_document_topics
+from src.evaluation import calculate_coherence, calculate_coherence_async
+from src.keyword_extractor import extract_keywords, extract_document_keywords
+from src.summarizer import summarize_text
+from src.topic_selection import select_num_topics
+from src.visualizations import word_frequencies
+
+
+def analysis_key(documents, **settings) -> str:
+    """
+    Hash of the input documents plus every setting that changes the results.
+    Identical input and settings always map to the same key.
+    """
+    h = hashlib.sha256()
+    for d in documents:
+        h.update(d["name"].encode("utf-8", errors="ignore") + b"\x00")
+        h.update(d["text"].encode("utf-8", errors="ignore") + b"\x01")
+    h.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def run_analysis_pipeline(documents, num_topics=5, num_keywords=15, num_summary_sentences=5,
+                          corpus_mode="combined", chunk_words=500, summary_method="tfidf",
+                          coherence_measure="c_v", background_coherence=False,
+                          auto_topics=False, topic_budget_s=None):
+    """
+    Run the full Milestone 1 pipeline and return everything the UI renders.
+    Only plain results are kept (no models or matrices) so the dict is cheap
+    to hold in a session cache.
+    With background_coherence=True, "coherence" is a Future that keeps
+    scoring while the caller renders; see resolve_coherence().
+    With auto_topics=True, num_topics is chosen by a parallel coherence sweep
+    over 2–10 topics (bounded by topic_budget_s, default RS_TOPIC_SWEEP_BUDGET)
+    and the curve is returned; if no count finishes in time, the given
+    num_topics (default 5) is used and "topic_warning" says so.
+    """
+    raw_text = "\n\n".join(d["text"] for d in documents)
+    stats = get_text_stats(raw_text)
+    row_names, row_texts = build_corpus(documents, mode=corpus_mode, chunk_words=chunk_words)
+    corpus = preprocess_corpus(row_texts)
+    processed = " ".join(corpus)
+    tfidf_matrix, feature_names, _ = build_tfidf(corpus)
+    keywords = extract_keywords(tfidf_matrix, feature_names, top_n=num_keywords)
+    topic_curve = topic_warning = sweep = None
+    if auto_topics:
+        if topic_budget_s is None:
+            topic_budget_s = config.TOPIC_SWEEP_BUDGET
+        try:
+            sweep = select_num_topics(corpus, measure=coherence_measure, budget_s=topic_budget_s)
+        except TimeoutError:
+            num_topics = num_topics or 5
+            topic_warning = (
+                f"No topic count finished within {topic_budget_s:.0f}s; "
+                f"used {num_topics} topics instead."
+            )
+    if sweep is not None:
+        lda_model, topics = sweep["lda_model"], sweep["topics"]
+        dictionary = lda_model.id2word
+        corpus_g = [dictionary.doc2bow(text.split()) for text in corpus]
+        num_topics, topic_curve = sweep["num_topics"], sweep["curve"]
+    else:
+        lda_model, topics, corpus_g, dictionary = build_lda_model(corpus, num_topics=num_topics)
+    doc_topics = get_document_topics(lda_model, corpus_g)
+    doc_keywords = extract_document_keywords(tfidf_matrix, feature_names, top_n=5)
+    if sweep is not None:
+        coherence = sweep["coherence"]  # already scored during the sweep
+    elif background_coherence:
+        coherence = calculate_coherence_async(
+            lda_model, corpus, dictionary, measure=coherence_measure, corpus=corpus_g
+        )
+    else:
+        try:
+            coherence = calculate_coherence(
+                lda_model, corpus, dictionary, measure=coherence_measure, corpus=corpus_g
+            )
+        except Exception:
+            coherence = None
+    summary, scored_sentences = summarize_text(
+        raw_text, num_sentences=num_summary_sentences, method=summary_method
+    )
+    return {
+        "doc_count": len(documents),
+        "stats": stats,
+        "word_freqs": word_frequencies(processed),
+        "keywords": keywords,
+        "topics": topics,
+        "coherence": coherence,
+        "coherence_measure": coherence_measure,
+        "num_topics": num_topics,
+        "topic_curve": topic_curve,
+        "topic_warning": topic_warning,
+        "summary": summary,
+        "scored_sentences": scored_sentences,
+        "summary_method": summary_method,
+        "row_names": row_names,
+        "doc_topics": doc_topics,
+        "doc_keywords": doc_keywords,
+    }
+
+
+def resolve_coherence(results, timeout=None):
+    """
+    Wait for a background coherence score and store the value in `results`.
+    Returns the score, or None if scoring failed.
+    """
+    coherence = results.get("coherence")
+    if isinstance(coherence, Future):
+        try:
+            coherence = coherence.result(timeout=timeout)
+        except Exception:
+            coherence = None
+        results["coherence"] = coherence
+    return coherence
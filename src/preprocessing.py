@@ -1,18 +1,97 @@
 import re
+import threading
+import time
 import nltk
-import spacy
-from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
 
-# Auto-download required NLTK data on first run
-for pkg in ['punkt', 'punkt_tab', 'stopwords']:
-    try:
-        nltk.data.find(f'tokenizers/{pkg}' if 'punkt' in pkg else f'corpora/{pkg}')
-    except LookupError:
-        nltk.download(pkg, quiet=True)
+# spaCy components that lemmatization does not need; skipping them roughly
+# halves model load time and per-document work.
+SPACY_EXCLUDE = ["parser", "ner", "senter"]
+
+# Lemmatization streams fixed-size token chunks through nlp.pipe so long
+# documents never build one huge Doc or hit spaCy's max_length.
+LEMMA_CHUNK_TOKENS = 5000
+LEMMA_BATCH_SIZE = 4
+
+_nlp = None
+_stop_words = None
+_nltk_ready = False
+_warmup_started = False
+_load_lock = threading.Lock()
+_timings = {}
+
+
+def _ensure_nltk_data():
+    # Auto-download required NLTK data on first run
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    for pkg in ['punkt', 'punkt_tab', 'stopwords']:
+        try:
+            nltk.data.find(f'tokenizers/{pkg}' if 'punkt' in pkg else f'corpora/{pkg}')
+        except LookupError:
+            nltk.download(pkg, quiet=True)
+    _nltk_ready = True
+
+
+def _load_models():
+    """Load NLTK data and the trimmed spaCy pipeline once per process."""
+    global _nlp, _stop_words
+    with _load_lock:
+        if _nlp is not None:
+            return
+        import spacy
+        from nltk.corpus import stopwords
+
+        start = time.perf_counter()
+        _ensure_nltk_data()
+        _stop_words = set(stopwords.words("english"))
+        _timings["nltk_load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
+        _timings["spacy_load_s"] = time.perf_counter() - start
+
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it on first use."""
+    if _nlp is None:
+        _load_models()
+    return _nlp
+
+
+def get_stop_words():
+    """Return the NLTK English stopword set, loading it on first use."""
+    if _stop_words is None:
+        _load_models()
+    return _stop_words
+
+
+def warmup(background=True):
+    """
+    Load the NLP models ahead of the first request.
+    With background=True this returns immediately and loads on a daemon thread.
+    """
+    global _warmup_started
+    if _nlp is not None or _warmup_started:
+        return None
+    _warmup_started = True
+    if background:
+        thread = threading.Thread(target=_load_models, name="nlp-warmup", daemon=True)
+        thread.start()
+        return thread
+    _load_models()
+    return None
+
+
+def get_load_timings():
+    """
+    Load timings in seconds: nltk_load_s, spacy_load_s and first_preprocess_s
+    (the first preprocess_text call, including any model load it waited on).
+    Keys appear once the corresponding step has run.
+    """
+    return dict(_timings)
 
-nlp = spacy.load("en_core_web_sm")
-stop_words = set(stopwords.words("english"))
 
 def clean_text(text):
     text = text.lower()
@@ -21,24 +100,60 @@ def clean_text(text):
     return text
 
 def tokenize(text):
+    _ensure_nltk_data()
     return word_tokenize(text)
 
 def remove_stopwords(tokens):
+    stop_words = get_stop_words()
     return [word for word in tokens if word not in stop_words and word.isalpha()]
 
-def lemmatize(tokens):
-    doc = nlp(" ".join(tokens))
-    return [token.lemma_ for token in doc if token.lemma_.isalpha()]
+def _token_chunks(tokens, chunk_size):
+    for i in range(0, len(tokens), chunk_size):
+        yield " ".join(tokens[i:i + chunk_size])
+
+def iter_lemmas(tokens, chunk_size=LEMMA_CHUNK_TOKENS, batch_size=LEMMA_BATCH_SIZE):
+    """Yield alphabetic lemmas chunk by chunk; only `batch_size` chunks are parsed at once."""
+    docs = get_nlp().pipe(_token_chunks(tokens, chunk_size), batch_size=batch_size)
+    for doc in docs:
+        for token in doc:
+            if token.lemma_.isalpha():
+                yield token.lemma_
+
+def lemmatize(tokens, chunk_size=LEMMA_CHUNK_TOKENS, batch_size=LEMMA_BATCH_SIZE):
+    return list(iter_lemmas(tokens, chunk_size, batch_size))
 
 def preprocess_text(text):
+    start = time.perf_counter()
     text = clean_text(text)
     tokens = tokenize(text)
     tokens = remove_stopwords(tokens)
-    tokens = lemmatize(tokens)
-    return " ".join(tokens)
+    processed = " ".join(iter_lemmas(tokens))
+    _timings.setdefault("first_preprocess_s", time.perf_counter() - start)
+    return processed
+
+def preprocess_corpus(texts, batch_size=LEMMA_BATCH_SIZE):
+    """
+    Preprocess many documents at once. Every document's token chunks share a
+    single nlp.pipe stream, so large corpora avoid per-document pipeline
+    overhead. Returns one processed string per input text, in order.
+    """
+    start = time.perf_counter()
+
+    def chunks():
+        for i, text in enumerate(texts):
+            tokens = remove_stopwords(tokenize(clean_text(text)))
+            for chunk in _token_chunks(tokens, LEMMA_CHUNK_TOKENS):
+                yield chunk, i
+
+    lemmas = [[] for _ in texts]
+    for doc, i in get_nlp().pipe(chunks(), batch_size=batch_size, as_tuples=True):
+        lemmas[i].extend(t.lemma_ for t in doc if t.lemma_.isalpha())
+    _timings.setdefault("first_preprocess_s", time.perf_counter() - start)
+    return [" ".join(words) for words in lemmas]
 
 def get_text_stats(text):
     """Return basic stats about the raw text."""
+    _ensure_nltk_data()
     sentences = sent_tokenize(text)
     words = word_tokenize(text)
     words_alpha = [w for w in words if w.isalpha()]
@@ -46,4 +161,4 @@ def get_text_stats(text):
         "sentences": len(sentences),
         "words": len(words_alpha),
         "unique_tokens": len(set(w.lower() for w in words_alpha)),
-    }
\ No newline at end of file
+    }
@@ -1,13 +1,89 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
+import scipy.sparse as sp
 import nltk
 
-def summarize_text(text, num_sentences=5):
+SUMMARY_METHODS = ("tfidf", "textrank")
+
+def _top_per_group(groups, weights, k):
+    """Mask of the `k` largest weights within each group (vectorised, no per-group loop)."""
+    order = np.lexsort((-weights, groups))
+    sorted_groups = groups[order]
+    rank = np.arange(order.size) - np.searchsorted(sorted_groups, sorted_groups, side="left")
+    mask = np.zeros(order.size, dtype=bool)
+    mask[order[rank < k]] = True
+    return mask
+
+def _candidate_pairs(X, terms_per_sentence, max_postings):
+    """
+    Sentence pairs worth scoring: pairs that share one of their
+    `terms_per_sentence` heaviest terms. Each term's posting list is cut to
+    the `max_postings` sentences weighting it most, so a common term adds at
+    most max_postings ** 2 pairs and the total stays linear in the number of
+    sentences. Returns (i, j) index arrays with i != j.
+    """
+    coo = X.tocoo()
+    rows, cols, data = coo.row, coo.col, coo.data
+    keep = _top_per_group(rows, data, terms_per_sentence)
+    rows, cols, data = rows[keep], cols[keep], data[keep]
+    keep = _top_per_group(cols, data, max_postings)
+    B = sp.csr_matrix((np.ones(keep.sum()), (rows[keep], cols[keep])), shape=X.shape)
+    pairs = (B @ B.T).tocoo()
+    off_diagonal = pairs.row != pairs.col
+    return pairs.row[off_diagonal], pairs.col[off_diagonal]
+
+def _textrank_scores(tfidf_matrix, top_k=10, damping=0.85, max_iter=100, tol=1e-6,
+                     terms_per_sentence=5, max_postings=30, chunk_size=20_000):
+    """
+    TextRank over a sparse sentence-similarity graph.
+    Rows of the TF-IDF matrix are L2-normalised, so row dot products are
+    cosine similarities. Rather than comparing every sentence with every
+    other one, only the candidate pairs from _candidate_pairs() are scored
+    (in chunks of `chunk_size` pairs), and each sentence keeps its `top_k`
+    strongest neighbours. Both the similarity pass and the graph grow
+    linearly with the number of sentences.
+    """
+    X = tfidf_matrix.tocsr()
+    n = X.shape[0]
+    i_idx, j_idx = _candidate_pairs(X, terms_per_sentence, max_postings)
+    sims = np.empty(i_idx.size)
+    for start in range(0, i_idx.size, chunk_size):
+        end = start + chunk_size
+        sims[start:end] = np.asarray(
+            X[i_idx[start:end]].multiply(X[j_idx[start:end]]).sum(axis=1)
+        ).ravel()
+
+    keep = _top_per_group(i_idx, sims, top_k) & (sims > 0)
+
+    W = sp.csr_matrix((sims[keep], (i_idx[keep], j_idx[keep])), shape=(n, n))
+    W = W.maximum(W.T)  # keep an edge if either endpoint picked it
+    out_weight = np.asarray(W.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    P_T = (sp.diags(inv) @ W).T.tocsr()  # column-stochastic transition matrix
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = (1 - damping) / n + damping * (P_T @ scores + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < tol:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+def summarize_text(text, num_sentences=5, method="tfidf", top_k_neighbors=10):
     """
     Extractive summarization using TF-IDF sentence scoring.
+    method="tfidf" scores each sentence by its summed TF-IDF weight;
+    method="textrank" ranks sentences by centrality in a sparse cosine
+    similarity graph (see _textrank_scores), which does not favour long
+    sentences the way summed weights do.
     Preserves the original sentence order in the output.
     Returns: (summary_string, list of (sentence, score) tuples)
     """
+    if method not in SUMMARY_METHODS:
+        raise ValueError(f"Unknown summary method: {method!r}")
+
     sentences = nltk.sent_tokenize(text)
     if not sentences:
         return "", []
@@ -21,11 +97,16 @@ def summarize_text(text, num_sentences=5):
     try:
         vectorizer = TfidfVectorizer(stop_words='english')
         tfidf_matrix = vectorizer.fit_transform(sentences)
-        sentence_scores = np.sum(tfidf_matrix.toarray(), axis=1)
     except ValueError:
         # Fallback: return first N sentences if TF-IDF fails
         return " ".join(sentences[:num_sentences]), []
 
+    if method == "textrank":
+        sentence_scores = _textrank_scores(tfidf_matrix, top_k=top_k_neighbors)
+    else:
+        # Row sums straight from the sparse matrix; no dense sentences × vocab copy
+        sentence_scores = np.asarray(tfidf_matrix.sum(axis=1)).ravel()
+
     # Rank sentences by score, keep original order for readability
     ranked_indices = np.argsort(sentence_scores)[::-1][:num_sentences]
     selected_indices = sorted(ranked_indices)  # preserve document order
@@ -33,4 +114,4 @@ def summarize_text(text, num_sentences=5):
     summary_sentences = [sentences[i] for i in selected_indices]
     scored_sentences = [(sentences[i], float(sentence_scores[i])) for i in selected_indices]
 
-    return " ".join(summary_sentences), scored_sentences
\ No newline at end of file
+    return " ".join(summary_sentences), scored_sentences
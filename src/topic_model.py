@@ -1,17 +1,42 @@
+import os
 import gensim
 from gensim import corpora
 
-def build_lda_model(texts, num_topics=5):
+def build_lda_model(texts, num_topics=5, workers=None, passes=10):
+    """
+    Train an LDA model on the processed texts (one document per entry).
+    Training runs on LdaMulticore with `workers` processes
+    (default: all cores but one); workers=1 trains in-process with LdaModel.
+    """
     tokenized_texts = [text.split() for text in texts]
     dictionary = corpora.Dictionary(tokenized_texts)
     corpus = [dictionary.doc2bow(text) for text in tokenized_texts]
 
-    lda_model = gensim.models.LdaModel(
-        corpus,
-        num_topics=num_topics,
-        id2word=dictionary,
-        passes=10
-    )
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 2) - 1)
+    if workers == 1:
+        lda_model = gensim.models.LdaModel(
+            corpus,
+            num_topics=num_topics,
+            id2word=dictionary,
+            passes=passes
+        )
+    else:
+        lda_model = gensim.models.LdaMulticore(
+            corpus,
+            num_topics=num_topics,
+            id2word=dictionary,
+            passes=passes,
+            workers=workers,
+        )
 
     topics = lda_model.print_topics()
-    return lda_model, topics, corpus, dictionary
\ No newline at end of file
+    return lda_model, topics, corpus, dictionary
+
+def get_document_topics(lda_model, corpus):
+    """Per-document topic mixture: a list of [(topic_id, probability), ...] per document."""
+    return [
+        sorted(lda_model.get_document_topics(bow, minimum_probability=0.0),
+               key=lambda x: x[1], reverse=True)
+        for bow in corpus
+    ]
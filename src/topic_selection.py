@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import queue
+import time
+
+from src.agent import config
+from src.topic_model import build_lda_model
+from src.evaluation import calculate_coherence
+
+_worker_texts = None
+
+
+def _init_worker(texts):
+    # Ship the corpus to each worker once instead of with every task
+    global _worker_texts
+    _worker_texts = texts
+
+
+def _score_candidate(num_topics, measure, passes):
+    """Worker: train one candidate single-threaded and score its coherence."""
+    lda_model, topics, corpus, dictionary = build_lda_model(
+        _worker_texts, num_topics=num_topics, workers=1, passes=passes
+    )
+    coherence = calculate_coherence(
+        lda_model, _worker_texts, dictionary, measure=measure, corpus=corpus, processes=1
+    )
+    return num_topics, float(coherence), lda_model, topics
+
+
+def _plateaued(candidates, scores, patience):
+    """True once `patience` consecutive candidates after the best failed to beat it."""
+    prefix = []
+    for k in candidates:
+        if k not in scores:
+            break
+        prefix.append(scores[k])
+    if not prefix:
+        return False
+    best_pos = max(range(len(prefix)), key=prefix.__getitem__)
+    return len(prefix) - 1 - best_pos >= patience
+
+
+def select_num_topics(texts, candidates=range(2, 11), measure="c_v", patience=2,
+                      budget_s=None, workers=None, passes=10):
+    """
+    Pick the number of LDA topics with the best coherence.
+
+    Candidate topic counts are trained in ascending order on a process pool
+    (`workers` processes, default: all cores, at most one per candidate) and
+    scored with calculate_coherence. No new candidates are started once
+    `patience` consecutive counts fail to improve on the best score, or once
+    `budget_s` seconds (default: RS_TOPIC_SWEEP_BUDGET) have passed; the pool
+    is then terminated, so candidates still training stop using CPU.
+
+    Returns a dict with num_topics, coherence, lda_model and topics of the
+    best candidate, the full coherence curve as [(num_topics, score), ...],
+    and flags stopped_early / timed_out. Raises TimeoutError if no candidate
+    finished within the budget.
+    """
+    candidates = sorted(set(candidates))
+    if not candidates:
+        raise ValueError("No candidate topic counts given")
+    workers = min(workers or os.cpu_count() or 1, len(candidates))
+    deadline = time.monotonic() + (config.TOPIC_SWEEP_BUDGET if budget_s is None else budget_s)
+
+    scores, models = {}, {}
+    pending = iter(candidates)
+    finished = queue.Queue()
+    in_flight = 0
+    stopped_early = timed_out = False
+    pool = multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(texts,))
+    try:
+        def submit_next():
+            nonlocal in_flight
+            k = next(pending, None)
+            if k is not None:
+                in_flight += 1
+                pool.apply_async(
+                    _score_candidate, (k, measure, passes),
+                    callback=lambda result, k=k: finished.put((k, result)),
+                    error_callback=lambda error, k=k: finished.put((k, None)),
+                )
+
+        for _ in range(workers):
+            submit_next()
+
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                k, result = finished.get(timeout=remaining)
+            except queue.Empty:
+                timed_out = True
+                break
+            in_flight -= 1
+            if result is None:
+                scores[k] = float("-inf")  # a failed candidate counts as no improvement
+            else:
+                _, scores[k], lda_model, topics = result
+                models[k] = (lda_model, topics)
+            if _plateaued(candidates, scores, patience):
+                stopped_early = True
+                break
+            submit_next()
+    finally:
+        pool.terminate()  # kills candidates still training after an early stop or timeout
+        pool.join()
+
+    if not models:
+        raise TimeoutError("No topic count finished within the time budget")
+    best_k = max(models, key=scores.get)
+    lda_model, topics = models[best_k]
+    return {
+        "num_topics": best_k,
+        "coherence": scores[best_k],
+        "lda_model": lda_model,
+        "topics": topics,
+        "curve": sorted((k, scores[k]) for k in models),
+        "stopped_early": stopped_early,
+        "timed_out": timed_out,
+    }
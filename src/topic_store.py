@@ -0,0 +1,267 @@
+import argparse
+import itertools
+import json
+import os
+import shutil
+import time
+import uuid
+
+from gensim import corpora
+from gensim.models import LdaModel
+
+from src.topic_model import build_lda_model
+
+MODEL_FILE = "lda.model"
+DICTIONARY_FILE = "dictionary.dict"
+CORPUS_FILE = "corpus.mm"  # single-file corpus of stores written before sharding
+CORPUS_DIR = "corpus"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+
+
+class TopicModelStore:
+    """
+    Persistent, incrementally updatable LDA model kept in a directory.
+
+    Each save writes a new version subdirectory (model, Dictionary and
+    metadata) and then atomically points CURRENT at it, so readers that have
+    the previous version memory-mapped are never disturbed. The training
+    corpus is kept as MmCorpus shards in a shared corpus/ directory, one per
+    train() or update() batch; a version's metadata lists the shards it
+    covers, so an update only writes its new documents. The vocabulary is
+    fixed when the model is first trained; words unseen at that point are
+    ignored by update() (the returned oov_rate shows how much new text is
+    being dropped).
+    """
+
+    def __init__(self, path: str, keep_versions: int = 2):
+        self.path = path
+        self.keep_versions = keep_versions
+        self._model = None
+        self._dictionary = None
+        self._version = None
+
+    # ── Versions on disk ───────────────────────────────────────────────────────
+    def exists(self) -> bool:
+        return self._current_version() is not None
+
+    def _current_version(self):
+        try:
+            with open(os.path.join(self.path, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _file(self, name, version=None):
+        return os.path.join(self.path, version or self._current_version(), name)
+
+    def _versions(self) -> list:
+        """Version directories, oldest first."""
+        versions = (d for d in os.listdir(self.path) if d[:1] == "v" and d[1:].isdigit())
+        return sorted(versions, key=lambda d: int(d[1:]))
+
+    def _new_version_dir(self) -> str:
+        """
+        Create and return a new version directory named v<milliseconds>.
+        Names always sort after existing versions; a name already taken
+        (another save in the same millisecond) moves on to the next one.
+        """
+        versions = self._versions()
+        stamp = max(int(time.time() * 1000), int(versions[-1][1:]) + 1 if versions else 0)
+        while True:
+            version = f"v{stamp}"
+            try:
+                os.makedirs(os.path.join(self.path, version))
+                return version
+            except FileExistsError:
+                stamp += 1
+
+    def _shard_file(self, shard: str) -> str:
+        return os.path.join(self.path, CORPUS_DIR, f"{shard}.mm")
+
+    def _write_shard(self, bows) -> str:
+        """Serialize one batch of BoW documents as a new corpus shard."""
+        shard = f"s{uuid.uuid4().hex}"
+        os.makedirs(os.path.join(self.path, CORPUS_DIR), exist_ok=True)
+        corpora.MmCorpus.serialize(self._shard_file(shard), bows)
+        return shard
+
+    def _legacy_shard(self, version: str) -> str:
+        """Copy a pre-sharding version's corpus.mm into a shard (once per store)."""
+        shard = f"s{uuid.uuid4().hex}"
+        os.makedirs(os.path.join(self.path, CORPUS_DIR), exist_ok=True)
+        src = self._file(CORPUS_FILE, version)
+        for suffix in ("", ".index"):
+            if os.path.exists(src + suffix):
+                shutil.copyfile(src + suffix, self._shard_file(shard) + suffix)
+        return shard
+
+    def _write_version(self, lda_model, dictionary, meta):
+        version = self._new_version_dir()
+        vdir = os.path.join(self.path, version)
+        lda_model.save(os.path.join(vdir, MODEL_FILE))
+        dictionary.save(os.path.join(vdir, DICTIONARY_FILE))
+        with open(os.path.join(vdir, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        tmp = os.path.join(self.path, CURRENT_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(version)
+        os.replace(tmp, os.path.join(self.path, CURRENT_FILE))
+        self._prune()
+        self._model = self._dictionary = None
+        return version
+
+    def _prune(self):
+        versions = self._versions()
+        for old in versions[:-self.keep_versions]:
+            shutil.rmtree(os.path.join(self.path, old), ignore_errors=True)
+
+        # Drop shards that no remaining version refers to
+        referenced = set()
+        for version in versions[-self.keep_versions:]:
+            try:
+                with open(self._file(META_FILE, version)) as f:
+                    referenced.update(json.load(f).get("shards", ()))
+            except (OSError, ValueError):
+                return  # unreadable metadata: keep every shard rather than guess
+        corpus_dir = os.path.join(self.path, CORPUS_DIR)
+        for name in os.listdir(corpus_dir) if os.path.isdir(corpus_dir) else ():
+            if name.split(".", 1)[0] not in referenced:
+                try:
+                    os.remove(os.path.join(corpus_dir, name))
+                except OSError:
+                    pass
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+    def train(self, texts, num_topics=5, **lda_kwargs) -> dict:
+        """Train a fresh model on processed texts and persist it."""
+        os.makedirs(self.path, exist_ok=True)
+        lda_model, _, corpus, dictionary = build_lda_model(texts, num_topics=num_topics, **lda_kwargs)
+        now = time.time()
+        meta = {"num_topics": num_topics, "num_docs": len(corpus), "created": now, "updated": now,
+                "shards": [self._write_shard(corpus)]}
+        self._write_version(lda_model, dictionary, meta)
+        return meta
+
+    def load(self, mmap="r"):
+        """
+        Load (model, dictionary). Large arrays are memory-mapped: "r" for
+        read-only querying, "c" (copy-on-write) when the model will be updated.
+        """
+        version = self._current_version()
+        if version is None:
+            raise FileNotFoundError(f"No topic model stored in {self.path}")
+        if self._model is None or self._version != version:
+            self._model = LdaModel.load(self._file(MODEL_FILE, version), mmap=mmap)
+            self._dictionary = corpora.Dictionary.load(self._file(DICTIONARY_FILE, version))
+            self._version = version
+        return self._model, self._dictionary
+
+    def metadata(self) -> dict:
+        with open(self._file(META_FILE)) as f:
+            return json.load(f)
+
+    def corpus(self):
+        """The stored training corpus, streamed from disk shard by shard."""
+        shards = self.metadata().get("shards")
+        if shards is None:
+            return corpora.MmCorpus(self._file(CORPUS_FILE))
+        return _ShardedCorpus([self._shard_file(shard) for shard in shards])
+
+    def update(self, texts) -> dict:
+        """Fold new processed texts into the model with online LDA and persist it."""
+        version = self._current_version()
+        if version is None:
+            raise FileNotFoundError(f"No topic model stored in {self.path}")
+        lda_model = LdaModel.load(self._file(MODEL_FILE, version), mmap="c")
+        dictionary = corpora.Dictionary.load(self._file(DICTIONARY_FILE, version))
+
+        total = known = 0
+        new_bows = []
+        for text in texts:
+            tokens = text.split()
+            bow = dictionary.doc2bow(tokens)
+            total += len(tokens)
+            known += sum(count for _, count in bow)
+            new_bows.append(bow)
+        if new_bows:
+            lda_model.update(new_bows)
+
+        meta = self.metadata()
+        meta["num_docs"] += len(new_bows)
+        meta["updated"] = time.time()
+        if "shards" not in meta:
+            meta["shards"] = [self._legacy_shard(version)]
+        if new_bows:
+            meta["shards"].append(self._write_shard(new_bows))
+        self._write_version(lda_model, dictionary, meta)
+        return {"documents": len(new_bows), "oov_rate": 1 - known / total if total else 0.0}
+
+    def topics(self, num_words=10):
+        """(topic_id, topic_string) pairs, in the same format as build_lda_model."""
+        lda_model, _ = self.load()
+        return lda_model.print_topics(num_topics=-1, num_words=num_words)
+
+    def document_topics(self, text):
+        """Topic mixture of one processed text under the stored model, best first."""
+        lda_model, dictionary = self.load()
+        bow = dictionary.doc2bow(text.split())
+        return sorted(lda_model.get_document_topics(bow, minimum_probability=0.0),
+                      key=lambda x: x[1], reverse=True)
+
+
+class _ShardedCorpus:
+    """Re-iterable view over several MmCorpus shards, in order."""
+
+    def __init__(self, paths):
+        self.shards = [corpora.MmCorpus(path) for path in paths]
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.shards)
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+
+# ── Command line ───────────────────────────────────────────────────────────────
+def _read_documents(paths):
+    from src.document_loader import load_pdf
+    texts = []
+    for path in paths:
+        with open(path, "rb") as f:
+            if path.endswith(".pdf"):
+                texts.append(load_pdf(f))
+            else:
+                texts.append(f.read().decode("utf-8", errors="ignore"))
+    return texts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage a persistent LDA topic model.")
+    parser.add_argument("store", help="directory holding the topic model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_train = sub.add_parser("train", help="train a new model from documents")
+    p_train.add_argument("files", nargs="+")
+    p_train.add_argument("--topics", type=int, default=5)
+    p_update = sub.add_parser("update", help="fold new documents into the model")
+    p_update.add_argument("files", nargs="+")
+    p_topics = sub.add_parser("topics", help="print the stored topics")
+    p_topics.add_argument("--words", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = TopicModelStore(args.store)
+    if args.command in ("train", "update"):
+        from src.preprocessing import preprocess_corpus
+        texts = preprocess_corpus(_read_documents(args.files))
+        if args.command == "train":
+            print(json.dumps(store.train(texts, num_topics=args.topics), indent=2))
+        else:
+            print(json.dumps(store.update(texts), indent=2))
+    else:
+        for topic_id, topic_str in store.topics(num_words=args.words):
+            print(f"Topic {topic_id + 1}: {topic_str}")
+
+
+if __name__ == "__main__":
+    main()
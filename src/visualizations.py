@@ -1,8 +1,19 @@
+import hashlib
+import io
+import json
+from collections import Counter
+import matplotlib
+matplotlib.use("Agg")  # headless: no GUI backend on the server
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
 
+from src.cache import TTLCache
+
+# PNG renders keyed by a hash of their inputs; identical analyses reuse them
+_png_cache = TTLCache(maxsize=64)
+
 plt.rcParams.update({
     "figure.facecolor": "#0e1117",
     "axes.facecolor": "#0e1117",
@@ -14,9 +25,8 @@ plt.rcParams.update({
     "grid.color": "#333",
 })
 
-def generate_wordcloud(text):
-    """Generate a styled word cloud figure."""
-    wc = WordCloud(
+def _wordcloud():
+    return WordCloud(
         width=900,
         height=400,
         background_color="#0e1117",
@@ -24,7 +34,13 @@ def generate_wordcloud(text):
         max_words=100,
         prefer_horizontal=0.9,
         collocations=False,
-    ).generate(text)
+    )
+
+def generate_wordcloud(text):
+    """Generate a styled word cloud figure."""
+    return _wordcloud_figure(_wordcloud().generate(text))
+
+def _wordcloud_figure(wc):
     fig, ax = plt.subplots(figsize=(10, 4.5))
     ax.imshow(wc, interpolation="bilinear")
     ax.axis("off")
@@ -83,4 +99,53 @@ def plot_topic_distribution(topics):
 
     fig.suptitle("LDA Topic Distribution", fontsize=13, y=1.02)
     fig.tight_layout()
-    return fig
\ No newline at end of file
+    return fig
+
+
+# ── PNG rendering ──────────────────────────────────────────────────────────────
+def _fig_to_png(fig) -> bytes:
+    """Serialize a figure to PNG bytes and always close it."""
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=110, bbox_inches="tight",
+                    facecolor=fig.get_facecolor())
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+def _cached_png(kind, payload, build_fig):
+    key = hashlib.sha256(
+        (kind + json.dumps(payload, default=str)).encode("utf-8")
+    ).hexdigest()
+    png = _png_cache.get(key)
+    if png is None:
+        fig = build_fig()
+        if fig is None:
+            return None
+        png = _fig_to_png(fig)
+        _png_cache.set(key, png)
+    return png
+
+def word_frequencies(processed, max_words=200):
+    """Most common words of processed text, as a dict for render_wordcloud."""
+    return dict(Counter(processed.split()).most_common(max_words))
+
+def render_wordcloud(frequencies):
+    """Word cloud PNG from precomputed {word: count} frequencies."""
+    if not frequencies:
+        return None
+    payload = sorted(frequencies.items())
+    return _cached_png(
+        "wordcloud", payload,
+        lambda: _wordcloud_figure(_wordcloud().generate_from_frequencies(frequencies)),
+    )
+
+def render_top_keywords(keywords):
+    """Keyword bar chart as PNG bytes (None if there are no keywords)."""
+    payload = [(str(w), float(s)) for w, s in keywords]
+    return _cached_png("keywords", payload, lambda: plot_top_keywords(keywords))
+
+def render_topic_distribution(topics):
+    """Topic word distribution chart as PNG bytes (None if there are no topics)."""
+    payload = [(int(t), str(s)) for t, s in topics]
+    return _cached_png("topics", payload, lambda: plot_topic_distribution(topics))